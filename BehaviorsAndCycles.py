@@ -1,106 +1,73 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import time
+from engine import FINGERPRINT_SIZE, get_engine, reference_block
+from orbits import run_orbit_analysis
+from seek import CycleDetector, GenerationSeeker
+from playback import play
+from terminal import is_headless, run_in_terminal
+from analysis_cache import AnalysisCache, analysis_key, pack_checkpoint, unpack_checkpoint
+from patterns import BUILTIN_RLE, builtin_pattern, place
 
 def insert_blinker(df, x, y):
     """
     Insert a blinker pattern 
     Pattern size: 3x3
     """
-    pattern = np.array([
-        [0, 1, 0],
-        [0, 1, 0],
-        [0, 1, 0],
-    ])
-    df[x:x+3, y:y+3] = pattern
+    place(df, builtin_pattern("blinker"), [(x, y)])
 
 def insert_traffic_light(df, x, y):
     """
     Insert a traffic light pattern 
     Pattern size: 4x4
     """
-    pattern = np.array([
-        [0, 1, 1, 0],
-        [1, 0, 0, 1],
-        [1, 0, 0, 1],
-        [0, 1, 1, 0],
-    ])
-    df[x:x+4, y:y+4] = pattern
+    place(df, builtin_pattern("traffic_light"), [(x, y)])
 
 def insert_small_oscillator(df, x, y):
     """
     Insert a small oscillator pattern 
     Pattern size: 2x2
     """
-    pattern = np.array([
-        [1, 0],
-        [0, 1]
-    ])
-    df[x:x+2, y:y+2] = pattern
+    place(df, builtin_pattern("small_oscillator"), [(x, y)])
 
 def insert_zigzag_glider(df, x, y):
     """
     Insert an interesting pattern that might produce glider-like behavior (we found it when we tried to find a glider)
     Pattern size: 3x3
     """
-    pattern = np.array([
-        [0, 1, 0],
-        [1, 0, 1],
-        [0, 1, 0],
-    ])
-    df[x:x+3, y:y+3] = pattern
+    place(df, builtin_pattern("zigzag_glider"), [(x, y)])
 
 def insert_plus_shape(df, x, y):
     """
     Insert a plus shape pattern
     Pattern size: 5x5
     """
-    pattern = np.array([
-        [0, 0, 1, 0, 0],
-        [0, 0, 1, 0, 0],
-        [1, 1, 1, 1, 1],
-        [0, 0, 1, 0, 0],
-        [0, 0, 1, 0, 0]
-    ])
-    df[x:x+5, y:y+5] = pattern
+    place(df, builtin_pattern("plus_shape"), [(x, y)])
 
 def insert_square_shape(df, x, y):
     """
     Insert a square shape pattern (creates gliders)
     Pattern size: 5x5
     """
-    pattern = np.array([
-        [1, 1, 1, 1, 1],
-        [1, 0, 0, 0, 1],
-        [1, 0, 0, 0, 1],
-        [1, 0, 0, 0, 1],
-        [1, 1, 1, 1, 1]
-    ])
-    df[x:x+5, y:y+5] = pattern
+    place(df, builtin_pattern("square_shape"), [(x, y)])
 
 def insert_x_shape(df, x, y):
     """
     Insert an X shape pattern
     Pattern size: 5x5
     """
-    pattern = np.array([
-        [1, 0, 0, 0, 1],
-        [0, 1, 0, 1, 0],
-        [0, 0, 1, 0, 0],
-        [0, 1, 0, 1, 0],
-        [1, 0, 0, 0, 1]
-    ])
-    df[x:x+5, y:y+5] = pattern
+    place(df, builtin_pattern("x_shape"), [(x, y)])
 
 def insert_single_cell(df, x, y):
     """
     Insert a single live cell
     Pattern size: 1x1
     """
-    df[x, y] = 1
+    place(df, builtin_pattern("single_cell"), [(x, y)])
 
-def initialize_automaton(height=100, width=100, pattern_type="blinker"):
+# Top-left corners of the three copies of the chosen pattern
+DEFAULT_POSITIONS = [(25, 25), (45, 45), (65, 65)]
+
+def initialize_automaton(height=100, width=100, pattern_type="blinker", positions=None):
     """
     Initialize the automaton with the selected pattern
     
@@ -110,48 +77,18 @@ def initialize_automaton(height=100, width=100, pattern_type="blinker"):
         "blinker", "traffic_light", "small_oscillator", 
         "zigzag_glider", "plus_shape", 
         "square_shape", "x_shape", "single_cell"
+      or a pattern as a 0/1 array (e.g. from patterns.read_rle or a PatternCatalog)
+    - positions: top-left corners of the copies, default DEFAULT_POSITIONS
     """
     df = np.zeros((height, width))
     
-    if pattern_type == "blinker":
-        insert_blinker(df, 25, 25)
-        insert_blinker(df, 45, 45)
-        insert_blinker(df, 65, 65)
-    
-    elif pattern_type == "traffic_light":
-        insert_traffic_light(df, 25, 25)
-        insert_traffic_light(df, 45, 45)
-        insert_traffic_light(df, 65, 65)
-    
-    elif pattern_type == "small_oscillator":
-        insert_small_oscillator(df, 25, 25)
-        insert_small_oscillator(df, 45, 45)
-        insert_small_oscillator(df, 65, 65)
-            
-    elif pattern_type == "zigzag_glider":
-        insert_zigzag_glider(df, 25, 25)
-        insert_zigzag_glider(df, 45, 45)
-        insert_zigzag_glider(df, 65, 65)
-            
-    elif pattern_type == "plus_shape":
-        insert_plus_shape(df, 25, 25)
-        insert_plus_shape(df, 45, 45)
-        insert_plus_shape(df, 65, 65)
-            
-    elif pattern_type == "square_shape":
-        insert_square_shape(df, 25, 25)
-        insert_square_shape(df, 45, 45)
-        insert_square_shape(df, 65, 65)
-    
-    elif pattern_type == "x_shape":
-        insert_x_shape(df, 25, 25)
-        insert_x_shape(df, 45, 45)
-        insert_x_shape(df, 65, 65)
-    
-    elif pattern_type == "single_cell":
-        insert_single_cell(df, 25, 25)
-        insert_single_cell(df, 45, 45)
-        insert_single_cell(df, 65, 65)
+    if positions is None:
+        positions = DEFAULT_POSITIONS
+    if isinstance(pattern_type, str):
+        if pattern_type in BUILTIN_RLE:
+            place(df, builtin_pattern(pattern_type), positions)
+    else:
+        place(df, pattern_type, positions)
     
     generation = 1
     return df, generation
@@ -160,91 +97,22 @@ def automaton_logic(df, i, j):
     """Apply the automaton rules to a 2x2 block"""
     if i+1 >= len(df) or j+1 >= len(df[0]):
         return  # Avoid index out of bounds
-        
-    count_ones = df[i, j] + df[i, j+1] + df[i+1, j] + df[i+1, j+1]
-    
-    if count_ones == 2:
-        pass  # Continue without changes
-    elif count_ones in (0, 1, 4):
-        # Flip all bits in the 2x2 block
-        df[i, j] = (df[i, j] + 1) % 2
-        df[i, j+1] = (df[i, j+1] + 1) % 2
-        df[i+1, j] = (df[i+1, j] + 1) % 2
-        df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-    elif count_ones == 3:
-        # Flip all bits and then swap diagonally
-        df[i, j] = (df[i, j] + 1) % 2
-        df[i, j+1] = (df[i, j+1] + 1) % 2
-        df[i+1, j] = (df[i+1, j] + 1) % 2
-        df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-        
-        # Swap diagonals
-        df[i, j], df[i+1, j+1] = df[i+1, j+1], df[i, j]
-        df[i+1, j], df[i, j+1] = df[i, j+1], df[i+1, j]
+    reference_block(df, i, i+1, j, j+1)
 
 def automaton_logic_wrapped(df, i, j):
     """Apply the automaton rules to a 2x2 block with wrapping"""
     height, width = df.shape
-    
-    # Get the wrapped indices for the 2x2 block
-    i1, i2 = i % height, (i + 1) % height
-    j1, j2 = j % width, (j + 1) % width
-    
-    count_ones = df[i1, j1] + df[i1, j2] + df[i2, j1] + df[i2, j2]
-    
-    if count_ones == 2:
-        pass  # Continue without changes
-    elif count_ones in (0, 1, 4):
-        # Flip all bits in the 2x2 block
-        df[i1, j1] = (df[i1, j1] + 1) % 2
-        df[i1, j2] = (df[i1, j2] + 1) % 2
-        df[i2, j1] = (df[i2, j1] + 1) % 2
-        df[i2, j2] = (df[i2, j2] + 1) % 2
-    elif count_ones == 3:
-        # Flip all bits and then swap diagonally
-        df[i1, j1] = (df[i1, j1] + 1) % 2
-        df[i1, j2] = (df[i1, j2] + 1) % 2
-        df[i2, j1] = (df[i2, j1] + 1) % 2
-        df[i2, j2] = (df[i2, j2] + 1) % 2
-        
-        # Swap diagonals
-        df[i1, j1], df[i2, j2] = df[i2, j2], df[i1, j1]
-        df[i2, j1], df[i1, j2] = df[i1, j2], df[i2, j1]
+    reference_block(df, i % height, (i + 1) % height, j % width, (j + 1) % width)
 
 def odd_gen(df):
     """Process odd generations"""
     height, width = df.shape
-    df_copy = df.copy()
-    
-    for i in range(0, height-1, 2):
-        for j in range(0, width-1, 2):
-            automaton_logic(df_copy, i, j)
-    
-    df[:] = df_copy[:]
+    get_engine(height, width, False).step(df, 1)
 
 def even_gen(df, wrap_around):
     """Process even generations"""
     height, width = df.shape
-    df_copy = df.copy()
-    
-    for i in range(1, height-1, 2):
-        for j in range(1, width-1, 2):
-            automaton_logic(df_copy, i, j)
-            
-    if wrap_around:
-        i = height - 1
-        for j in range(1, width-1, 2):
-            automaton_logic_wrapped(df_copy, i, j)
-            
-        # Handle right-left wrapping
-        j = width - 1
-        for i in range(1, height-1, 2):
-            automaton_logic_wrapped(df_copy, i, j)
-            
-        # Handle corner wrapping (bottom-right corner)
-        automaton_logic_wrapped(df_copy, height-1, width-1)
-    
-    df[:] = df_copy[:]
+    get_engine(height, width, wrap_around).step(df, 2)
 
 def detect_cycle(state_history):
     """
@@ -270,6 +138,36 @@ def detect_cycle(state_history):
     
     return 0, 0
 
+# Seekers cached per (pattern, wrap_around, height, width)
+_seekers = {}
+
+def get_seeker(pattern_type, wrap_around, height=100, width=100):
+    """
+    Get the cached GenerationSeeker for a pattern, creating it on first use
+    
+    Returns:
+    - seeker: GenerationSeeker starting at generation 1
+    """
+    key = (pattern_type, wrap_around, height, width)
+    if key not in _seekers:
+        df, generation = initialize_automaton(height, width, pattern_type)
+        _seekers[key] = GenerationSeeker(df, wrap_around, odd_gen, even_gen, generation)
+    return _seekers[key]
+
+def state_at(pattern_type, generation, wrap_around=True, height=100, width=100):
+    """
+    Get the state of a pattern at any generation without re-simulating from generation 1
+    
+    Parameters:
+    - pattern_type: pattern name as in initialize_automaton
+    - generation: generation number (generation 1 is the initial grid)
+    - wrap_around: whether to use wrap-around boundary conditions
+    
+    Returns:
+    - df: grid at that generation
+    """
+    return get_seeker(pattern_type, wrap_around, height, width).state_at(generation)
+
 def display_automaton(df, generation, fig, ax, img, state_history, pause_time=0.5):
     """
     Display the current state of the automaton and check for cycles
@@ -286,6 +184,7 @@ def display_automaton(df, generation, fig, ax, img, state_history, pause_time=0.
     - cycle_detected: True if a cycle was detected, False otherwise
     - period: length of the detected cycle
     """
+    import matplotlib.pyplot as plt
     ax.clear()
     img = ax.imshow(df, cmap='binary', vmin=0, vmax=1)
     
@@ -356,12 +255,71 @@ def pattern_choice():
         else:
             print("Invalid choice. Please enter a number between 1 and 8")
 
-def run_analysis(wrap_around=True):
+def analyze_pattern(pattern_type, wrap_around=True, height=100, width=100, max_generations=100,
+                    cache=None):
+    """
+    Find the cycle period of one pattern, using and updating the result cache
+    
+    A cached run that stopped below max_generations without finding a cycle is resumed from its
+    checkpoint instead of starting again from generation 1.
+    
+    Parameters:
+    - pattern_type: pattern name as in initialize_automaton
+    - wrap_around: whether to use wrap-around boundary conditions
+    - height, width: dimensions of the grid
+    - max_generations: maximum number of generations to simulate
+    - cache: AnalysisCache, or None to always simulate
+    
+    Returns:
+    - period: length of cycle if detected, 0 otherwise
+    - cycle_start: generation where the cycle starts
+    """
+    df, generation = initialize_automaton(height, width, pattern_type)
+    key = analysis_key(df, wrap_around)
+    entry = cache.get(key) if cache is not None else None
+    
+    if entry is not None and entry["period"]:
+        # A cycle found later than this run's cap would not have been seen by it
+        if entry["generations"] <= max_generations:
+            return entry["period"], entry["cycle_start"]
+        return 0, 0
+    if entry is not None and entry["generations"] >= max_generations:
+        return 0, 0
+    
+    if entry is not None:
+        # Resume from the checkpoint of a shorter run
+        origin = df.copy()
+        df = unpack_checkpoint(entry["checkpoint"], height, width, df.dtype)
+        blob = entry["digests"]
+        history = [blob[k:k+FINGERPRINT_SIZE] for k in range(0, len(blob), FINGERPRINT_SIZE)]
+        detector = CycleDetector(df, generation + entry["generations"], wrap_around, origin,
+                                 generation, history)
+    else:
+        detector = CycleDetector(df, generation, wrap_around)
+    
+    # Incremental fingerprints instead of rehashing every state; matches are confirmed exactly
+    while detector.generation - 1 < max_generations:
+        if detector.step(df):
+            break
+    period, cycle_start = detector.period, detector.cycle_start
+    
+    if cache is not None:
+        if period:
+            cache.put(key, period, cycle_start, detector.generation - 1)
+        else:
+            cache.put(key, 0, 0, detector.generation - 1, pack_checkpoint(df),
+                      detector.history_bytes())
+    return period, cycle_start
+
+def run_analysis(wrap_around=True, max_generations=100, cache=None, quiet=False):
     """
     Run analysis of cycle periods for all patterns
     
     Parameters:
     - wrap_around: whether to use wrap-around boundary conditions
+    - max_generations: maximum number of generations to simulate per pattern
+    - cache: AnalysisCache used to reuse and resume earlier runs, or None
+    - quiet: do not print progress
     
     Returns:
     - results: dictionary with cycle periods for each pattern
@@ -373,43 +331,23 @@ def run_analysis(wrap_around=True):
     
     results = {}
     
-    print(f"\nAnalyzing cycles with wrap-around={wrap_around}:")
+    if not quiet:
+        print(f"\nAnalyzing cycles with wrap-around={wrap_around}:")
     
     for pattern in patterns:
-        print(f"Analyzing {pattern}...")
-        df, generation = initialize_automaton(height, width, pattern)
-        state_history = [df.copy()]
-        
-        cycle_detected = False
-        period = 0
+        if not quiet:
+            print(f"Analyzing {pattern}...")
+        period, cycle_start = analyze_pattern(pattern, wrap_around, height, width,
+                                              max_generations, cache)
         
-        # Run for at most 100 generations or until we detect a cycle
-        for i in range(100):
-            if generation % 2 == 1:
-                odd_gen(df)
-            else:
-                even_gen(df, wrap_around)
-            generation += 1
-            
-            # Check for cycles
-            current_state = df.copy()
-            for j, past_state in enumerate(state_history):
-                if np.array_equal(past_state, current_state):
-                    cycle_detected = True
-                    period = len(state_history) - j
-                    break
-            
-            if cycle_detected:
-                break
-                
-            state_history.append(current_state)
-        
-        if cycle_detected:
+        if period:
             results[pattern] = period
-            print(f"  {pattern}: Period {period}")
+            if not quiet:
+                print(f"  {pattern}: Period {period}")
         else:
-            results[pattern] = "No cycle detected (> 100 generations)"
-            print(f"  {pattern}: No cycle detected")
+            results[pattern] = f"No cycle detected (> {max_generations} generations)"
+            if not quiet:
+                print(f"  {pattern}: No cycle detected")
     
     return results
 
@@ -417,16 +355,34 @@ def main():
     print("\nChoose mode:")
     print("1: Run visualization")
     print("2: Analyze cycle periods for all patterns")
+    print("3: Analyze orbit structure of a small wrap-around grid")
     
     mode_choice = input().strip()
     
-    if mode_choice == "2":
+    if mode_choice == "3":
+        # Cycle-length distribution over all (or sampled) states of a small torus
+        print("\nEnter grid height and width (e.g. 4 4, at most 64 cells):")
+        while True:
+            try:
+                height, width = (int(value) for value in input().split())
+            except ValueError:
+                print("Invalid size. Please enter two integers")
+                continue
+            if height > 0 and width > 0 and height * width <= 64:
+                break
+            print("Invalid size. The grid must have between 1 and 64 cells")
+        # Sampled orbits on the larger grids can run for hundreds of thousands of steps;
+        # a lower cap keeps the interactive run to a minute or so
+        run_orbit_analysis(height, width, wrap_around=True, max_period=10000)
+    elif mode_choice == "2":
         # Run analysis of cycle periods
         print("\nAnalyzing with wrap-around:")
-        results_wrap = run_analysis(True)
+        cache = AnalysisCache()
+        results_wrap = run_analysis(True, cache=cache)
         
         print("\nAnalyzing without wrap-around:")
-        results_no_wrap = run_analysis(False)
+        results_no_wrap = run_analysis(False, cache=cache)
+        cache.close()
         
         # Print summary
         print("\nSummary of cycle periods:")
@@ -448,7 +404,12 @@ def main():
         
         df, generation = initialize_automaton(height, width, pattern)
         
+        if is_headless():
+            run_in_terminal(df, generation, wrap_around, odd_gen, even_gen, 300, 0.2)
+            return
+        
         # Set up the plot for visualization
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 10))
         img = ax.imshow(df, cmap='binary')
         ax.set_title(f'Generation: {generation}')
@@ -459,30 +420,38 @@ def main():
         fig.canvas.draw()
         plt.pause(2.0)  # Initial pause of 2 seconds to see Generation 1
         
-        # For cycle detection
-        state_history = [df.copy()]
-        cycle_detected = False
-        period = 0
-        
         max_generations = 300  # Increased to 300 generations as requested
         pause_time = 0.2
         
-        for i in range(max_generations):
-            if generation % 2 == 1:
-                odd_gen(df)
+        # Frames come from the seeker, which also finds the cycle, so no state history is kept.
+        # The viewer has its own seeker (not get_seeker's) because edits rewrite its frames
+        seeker = GenerationSeeker(df, wrap_around, odd_gen, even_gen, generation)
+        
+        def display(df, generation, pause_time):
+            ax.clear()
+            ax.imshow(df, cmap='binary', vmin=0, vmax=1)
+            if seeker.period and generation >= seeker.cycle_start + seeker.period:
+                ax.set_title(f'Generation: {generation} - Period: {seeker.period}')
             else:
-                even_gen(df, wrap_around)
-            generation += 1
-            
-            # Update visualization and check for cycles
-            img, cycle_detected, period = display_automaton(df, generation, fig, ax, img, state_history, pause_time)
-            
-            # If we detected a cycle, run a few more generations to show it
-            if cycle_detected and i < max_generations - 10:
-                # Continue for a few more generations to show the cycle
-                continue
-            elif cycle_detected:
-                break
+                ax.set_title(f'Generation: {generation}')
+            ax.set_xticks([])
+            ax.set_yticks([])
+            fig.canvas.draw()
+            fig.canvas.flush_events()
+            plt.pause(pause_time)
+        
+        def state_at(generation):
+            # The seeker restarts at each edit; play steps forward through the generations before it
+            if generation < seeker.first_generation:
+                return None
+            return seeker.state_at(generation)
+        
+        def on_edit(df, cells, generation):
+            seeker.edit(df, generation)
+        
+        # Keyboard: space pause, left/right step, b reverse, up/down speed, e edit (click toggles)
+        play(df, generation, wrap_around, odd_gen, even_gen, display, fig, pause_time,
+             max_generations, state_at=state_at, on_edit=on_edit)
         
         plt.draw()
         plt.pause(3)
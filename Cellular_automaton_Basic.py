@@ -1,6 +1,8 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from engine import get_engine, reference_block
+from playback import play
+from random_init import random_grid
+from rendering import PyramidRenderer, PYRAMID_THRESHOLD
+from terminal import is_headless, run_in_terminal
 
 class CellularAutomatonBasic:
     '''construcor, create 2d grid'''
@@ -9,17 +11,22 @@ class CellularAutomatonBasic:
         self.width = 100
         self.max_generations = 250  # Number of generations to simulate
         self.pause_time = 0.2 # Pause time between generations (for visualization)
+        self.seed = None # Seed for the initial grid (None = fresh entropy each run)
+        self.renderer = None # Downsampling renderer, created for grids larger than the screen
+        self.terminal = False # Draw in the terminal instead of a matplotlib window
+        self.backend = None # Engine backend name to force (None = fastest for the grid)
         
-    def initialize_automaton(self, height=100, width=100, percentage=50):
+    def initialize_automaton(self, height=100, width=100, percentage=50, seed=None):
         """
         Initialize the grid with random 0s and 1s.
 
-        Parameters: height (int),width (int), percentage (int): Probability that the cell is 1
+        Parameters: height (int),width (int), percentage (int): Probability that the cell is 1,
+                    seed (int or np.random.SeedSequence): Seed for a reproducible grid
     
-        Returns: df (np.ndarray): Initialized grid generation (int): Starting generation number
+        Returns: df (np.ndarray): Initialized grid (uint8) generation (int): Starting generation number
         """        
         probability = percentage / 100
-        df = np.random.choice([1, 0], size=(height, width), p=[probability, 1-probability])
+        df = random_grid(height, width, probability, seed)
         generation = 1
         return df, generation
 
@@ -31,27 +38,7 @@ class CellularAutomatonBasic:
         """
         if i+1 >= len(df) or j+1 >= len(df[0]):
             return  # Avoid index out of bounds
-        # count the number of ones in the block
-        count_ones = df[i, j] + df[i, j+1] + df[i+1, j] + df[i+1, j+1]
-        
-        if count_ones == 2:
-            pass  # Continue without changes
-        elif count_ones in (0, 1, 4):
-            # Flip all bits in the 2x2 block
-            df[i, j] = (df[i, j] + 1) % 2
-            df[i, j+1] = (df[i, j+1] + 1) % 2
-            df[i+1, j] = (df[i+1, j] + 1) % 2
-            df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-        elif count_ones == 3:
-            # Flip all bits and then swap diagonally
-            df[i, j] = (df[i, j] + 1) % 2
-            df[i, j+1] = (df[i, j+1] + 1) % 2
-            df[i+1, j] = (df[i+1, j] + 1) % 2
-            df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-            
-            # Swap diagonals
-            df[i, j], df[i+1, j+1] = df[i+1, j+1], df[i, j]
-            df[i+1, j], df[i, j+1] = df[i, j+1], df[i+1, j]
+        reference_block(df, i, i+1, j, j+1)
 
     def automaton_logic_wrapped(self, df, i, j):
         """
@@ -60,32 +47,7 @@ class CellularAutomatonBasic:
         Parameters: df (np.ndarray): Grid, i (int): Row index, j (int): Column index
         """        
         height, width = df.shape
-        
-        # Get the wrapped indices for the 2x2 block
-        i1, i2 = i % height, (i + 1) % height
-        j1, j2 = j % width, (j + 1) % width
-        
-        count_ones = df[i1, j1] + df[i1, j2] + df[i2, j1] + df[i2, j2]
-        
-        if count_ones == 2:
-            pass  # Continue without changes
-        elif count_ones in (0, 1, 4):
-            # Flip all bits in the 2x2 block
-            df[i1, j1] = (df[i1, j1] + 1) % 2
-            df[i1, j2] = (df[i1, j2] + 1) % 2
-            df[i2, j1] = (df[i2, j1] + 1) % 2
-            df[i2, j2] = (df[i2, j2] + 1) % 2
-        elif count_ones == 3:
-            # Flip all bits and then swap diagonally
-            df[i1, j1] = (df[i1, j1] + 1) % 2
-            df[i1, j2] = (df[i1, j2] + 1) % 2
-            df[i2, j1] = (df[i2, j1] + 1) % 2
-            df[i2, j2] = (df[i2, j2] + 1) % 2
-            
-            # Swap diagonals
-            df[i1, j1], df[i2, j2] = df[i2, j2], df[i1, j1]
-            df[i2, j1], df[i1, j2] = df[i1, j2], df[i2, j1]
-
+        reference_block(df, i % height, (i + 1) % height, j % width, (j + 1) % width)
 
     def odd_gen(self, df):
         """
@@ -93,9 +55,7 @@ class CellularAutomatonBasic:
         Parameters: df (np.ndarray): Grid
         """
         height, width = df.shape
-        for i in range(0, height-1, 2):
-            for j in range(0, width-1, 2):
-                self.automaton_logic(df, i, j)
+        get_engine(height, width, False, self.backend).step(df, 1)
 
     def even_gen(self, df, wrap_around):
         """
@@ -103,21 +63,7 @@ class CellularAutomatonBasic:
         Parameters: df (np.ndarray): Grid, wrap_around (bool): Whether to apply wrap-around logic at borders
         """
         height, width = df.shape
-        for i in range(1, height-1, 2):
-            for j in range(1, width-1, 2):
-                self.automaton_logic(df, i, j)
-        if wrap_around:
-            i = height - 1
-            for j in range(1, width-1, 2):
-                self.automaton_logic_wrapped(df, i, j)
-                
-            # Handle right-left wrapping
-            j = width - 1
-            for i in range(1, height-1, 2):
-                self.automaton_logic_wrapped(df, i, j)
-                
-            # Handle corner wrapping (bottom-right corner)
-            self.automaton_logic_wrapped(df, height-1, width-1)
+        get_engine(height, width, wrap_around, self.backend).step(df, 2)
 
     def display_automaton(self, df, generation, fig, ax, img, pause_time=0.5):
         """
@@ -131,11 +77,19 @@ class CellularAutomatonBasic:
         Returns:
             tuple: Updated image object for animation
         """
-        ax.clear()
-        img = ax.imshow(df, cmap='binary', vmin=0, vmax=1)
-        ax.set_title(f'Generation: {generation}')
-        ax.set_xticks([])
-        ax.set_yticks([])
+        import matplotlib.pyplot as plt
+        if max(df.shape) > PYRAMID_THRESHOLD:
+            # Draw a screen-sized downsampled view instead of the full grid
+            if self.renderer is None or self.renderer.ax is not ax:
+                ax.clear()
+                self.renderer = PyramidRenderer(ax)
+            img = self.renderer.draw(df, f'Generation: {generation}')
+        else:
+            ax.clear()
+            img = ax.imshow(df, cmap='binary', vmin=0, vmax=1)
+            ax.set_title(f'Generation: {generation}')
+            ax.set_xticks([])
+            ax.set_yticks([])
         
         # Force the figure to update
         fig.canvas.draw()
@@ -196,9 +150,15 @@ class CellularAutomatonBasic:
         percentage = self.get_user_choice()
         print(f"Initializing with {percentage}% black cells...")
         
-        df, generation = self.initialize_automaton(height, width, percentage)
+        df, generation = self.initialize_automaton(height, width, percentage, self.seed)
+        
+        if self.terminal or is_headless():
+            run_in_terminal(df, generation, wrap_around, self.odd_gen, self.even_gen,
+                            self.max_generations, self.pause_time)
+            return
         
         # Set up the plot for visualization
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots()
         img = ax.imshow(df, cmap='binary')  # binary colormap: 0=white, 1=black
         # Remove axis numbers/ticks
@@ -208,15 +168,12 @@ class CellularAutomatonBasic:
         max_generations = self.max_generations
         pause_time = self.pause_time  # Time in seconds to display each generation
         
-        for i in range(max_generations):
-            if generation % 2 == 1:
-                self.odd_gen(df)  # Changes happen in-place
-            else:
-                self.even_gen(df, wrap_around)  # Changes happen in-place
-        
-            # Update visualization
+        def display(df, generation, pause_time):
             self.display_automaton(df, generation, fig, ax, img, pause_time)
-            generation += 1
+        
+        # Keyboard: space pause, left/right step, b reverse, up/down speed, e edit (click toggles)
+        play(df, generation, wrap_around, self.odd_gen, self.even_gen, display, fig,
+             pause_time, max_generations)
 
         plt.draw()
         plt.pause(3)  # Wait for 3 seconds
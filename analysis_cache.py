@@ -0,0 +1,112 @@
+import os
+import time
+import hashlib
+import sqlite3
+import numpy as np
+from engine import BLOCK_RULE, ENGINE_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "cellular_automaton",
+                                  "analysis.sqlite")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def analysis_key(df, wrap_around):
+    """
+    Cache key of an analysis run.
+
+    Covers the initial grid contents, grid size, wrap mode, block rule table and engine version.
+    """
+    height, width = df.shape
+    hasher = hashlib.sha256()
+    hasher.update(f"v{ENGINE_VERSION}:{height}x{width}:wrap={bool(wrap_around)}:".encode())
+    hasher.update(BLOCK_RULE.tobytes())
+    hasher.update(np.packbits(np.asarray(df).astype(np.uint8), axis=None).tobytes())
+    return hasher.hexdigest()
+
+
+class AnalysisCache:
+    """
+    On-disk cache of cycle analysis results, stored in SQLite.
+
+    Each entry holds the period, cycle start and number of generations simulated. Entries without
+    a cycle also keep a checkpoint (the last state and the fingerprints of every state seen), so a run
+    with a higher generation cap resumes where the cached one stopped. Entries are evicted least
+    recently used first once the cache grows past max_bytes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                period INTEGER NOT NULL,
+                cycle_start INTEGER NOT NULL,
+                generations INTEGER NOT NULL,
+                checkpoint BLOB,
+                digests BLOB,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )""")
+        self.connection.commit()
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns: dict with period, cycle_start, generations, checkpoint, digests, or None
+        """
+        row = self.connection.execute(
+            "SELECT period, cycle_start, generations, checkpoint, digests FROM results WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?",
+                                (time.time(), key))
+        self.connection.commit()
+        period, cycle_start, generations, checkpoint, digests = row
+        return {"period": period, "cycle_start": cycle_start, "generations": generations,
+                "checkpoint": checkpoint, "digests": digests}
+
+    def put(self, key, period, cycle_start, generations, checkpoint=None, digests=None):
+        """Store an entry, then evict least recently used entries beyond max_bytes."""
+        size = len(key) + len(checkpoint or b"") + len(digests or b"") + 64
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, period, cycle_start, generations, checkpoint, digests, size, time.time()))
+        self.evict()
+        self.connection.commit()
+
+    def evict(self):
+        """Delete least recently used entries until the total size fits in max_bytes."""
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        """Remove every cached entry."""
+        self.connection.execute("DELETE FROM results")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def pack_checkpoint(df):
+    """Bit-pack a grid for storage in a cache entry."""
+    return np.packbits(np.asarray(df).astype(np.uint8), axis=None).tobytes()
+
+
+def unpack_checkpoint(blob, height, width, dtype=float):
+    """Rebuild a grid stored with pack_checkpoint."""
+    bits = np.unpackbits(np.frombuffer(blob, dtype=np.uint8), count=height*width)
+    return bits.reshape(height, width).astype(dtype)
@@ -0,0 +1,254 @@
+"""
+Non-interactive command line for batch jobs.
+
+    python cli.py simulate --size 200x200 --percentage 30 --seed 1 --generations 500 --output final.npy
+    python cli.py analyze --max-generations 200 --json
+    python cli.py sweep --percentages 25,50,75 --seeds 8 --generations 300
+    python cli.py export --pattern plus_shape --generations 1,64,1000000 --output frames.npz
+    python cli.py simulate --rle glider.rle --size 64x64 --renderer terminal
+    python cli.py study --sizes 8x8,8x9,16x16 --workers 4 --output periods.csv
+
+Only NumPy is imported at startup; matplotlib is loaded when the gui renderer is selected.
+"""
+import sys
+import json
+import argparse
+import numpy as np
+from engine import odd_gen, even_gen
+from random_init import random_grid
+from seek import GenerationSeeker
+from metrics import MetricsRecorder
+from patterns import BUILTIN_RLE
+
+PATTERNS = ["blinker", "traffic_light", "small_oscillator",
+            "zigzag_glider", "plus_shape",
+            "square_shape", "x_shape", "single_cell"]
+
+
+def parse_size(text):
+    """Parse a grid size such as 100x100."""
+    try:
+        height, width = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size {text!r}, expected HEIGHTxWIDTH")
+    return height, width
+
+
+def parse_size_list(text):
+    """Parse a comma-separated list of grid sizes such as 8x8,8x9."""
+    return [parse_size(value) for value in text.split(",") if value]
+
+
+def parse_pattern_list(text):
+    """Parse a comma-separated list of built-in pattern names."""
+    names = [name for name in text.split(",") if name]
+    unknown = [name for name in names if name not in BUILTIN_RLE]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown patterns {unknown}, "
+                                         f"choose from {', '.join(BUILTIN_RLE)}")
+    return names
+
+
+def parse_wrap_modes(text):
+    """Parse a comma-separated list of wrap modes (wrap, no-wrap) into booleans."""
+    modes = [mode for mode in text.split(",") if mode]
+    unknown = [mode for mode in modes if mode not in ("wrap", "no-wrap")]
+    if unknown or not modes:
+        raise argparse.ArgumentTypeError(f"Invalid wrap modes {text!r}, expected wrap,no-wrap")
+    return [mode == "wrap" for mode in modes]
+
+
+def parse_int_list(text):
+    """Parse a comma-separated list of integers."""
+    try:
+        return [int(value) for value in text.split(",") if value]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid list {text!r}, expected e.g. 1,2,3")
+
+
+def initial_grid(args):
+    """Initial grid from --rle, --pattern or --percentage/--seed."""
+    height, width = args.size
+    if args.rle:
+        from patterns import read_rle, place
+        pattern = read_rle(args.rle)
+        df = np.zeros((height, width), dtype=np.uint8)
+        # Centered; larger patterns wrap around the grid edges
+        place(df, pattern, [((height - pattern.shape[0]) // 2, (width - pattern.shape[1]) // 2)],
+              wrap_around=True)
+        return df, 1
+    if args.pattern:
+        from BehaviorsAndCycles import initialize_automaton
+        df, generation = initialize_automaton(height, width, args.pattern)
+        return df.astype(np.uint8), generation
+    return random_grid(height, width, args.percentage / 100, args.seed), 1
+
+
+def simulate(args):
+    df, generation = initial_grid(args)
+    if args.renderer == "terminal":
+        from terminal import run_in_terminal
+        generation = run_in_terminal(df, generation, args.wrap, odd_gen, even_gen,
+                                     args.generations, args.pause)
+    elif args.renderer == "gui":
+        import matplotlib.pyplot as plt
+        from playback import play
+        fig, ax = plt.subplots(figsize=(10, 10))
+
+        def display(df, generation, pause_time):
+            ax.clear()
+            ax.imshow(df, cmap='binary', vmin=0, vmax=1)
+            ax.set_title(f'Generation: {generation}')
+            ax.set_xticks([])
+            ax.set_yticks([])
+            plt.pause(pause_time)
+
+        generation = play(df, generation, args.wrap, odd_gen, even_gen, display,
+                          fig, args.pause or 0.05, args.generations)
+        plt.close(fig)
+    else:
+        recorder = MetricsRecorder(args.metrics, df) if args.metrics else None
+        for _ in range(args.generations):
+            histogram = recorder.new_histogram() if recorder else None
+            if generation % 2 == 1:
+                odd_gen(df, histogram)
+            else:
+                even_gen(df, args.wrap, histogram)
+            generation += 1
+            if recorder:
+                recorder.record(generation, histogram)
+        if recorder:
+            recorder.close()
+
+    if args.output:
+        np.save(args.output, df)
+    print(json.dumps({"generation": generation, "density": float(df.mean())}))
+
+
+def analyze(args):
+    from BehaviorsAndCycles import run_analysis
+    from analysis_cache import AnalysisCache, DEFAULT_CACHE_PATH
+    cache = None if args.no_cache else AnalysisCache(args.cache or DEFAULT_CACHE_PATH)
+    results = {}
+    for wrap_around in args.wrap_modes:
+        results["wrap" if wrap_around else "no_wrap"] = run_analysis(
+            wrap_around, args.max_generations, cache, quiet=args.json)
+    if cache is not None:
+        cache.close()
+    if args.json:
+        print(json.dumps(results))
+
+
+def sweep(args):
+    height, width = args.size
+    rows = []
+    for percentage in args.percentages:
+        for seed in range(args.seeds):
+            df = random_grid(height, width, percentage / 100, seed)
+            seeker = GenerationSeeker(df, args.wrap, odd_gen, even_gen,
+                                      max_frames=args.generations + 1)
+            period, cycle_start = seeker.find_cycle()
+            final = seeker.state_at(seeker.last_generation())
+            rows.append({"percentage": percentage, "seed": seed, "period": period,
+                         "cycle_start": cycle_start, "final_density": float(final.mean())})
+    if args.json:
+        print(json.dumps(rows))
+    else:
+        print("Percentage | Seed | Period | Cycle start | Final density")
+        for row in rows:
+            print(f"{row['percentage']:>10} | {row['seed']:>4} | {row['period']:>6} | "
+                  f"{row['cycle_start']:>11} | {row['final_density']:.4f}")
+
+
+def export(args):
+    df, generation = initial_grid(args)
+    seeker = GenerationSeeker(df, args.wrap, odd_gen, even_gen, generation,
+                              max_frames=args.max_frames)
+    frames = {f"generation_{g}": seeker.state_at(g) for g in args.generations}
+    np.savez_compressed(args.output, **frames)
+    print(json.dumps({"frames": len(frames), "period": seeker.period,
+                      "cycle_start": seeker.cycle_start}))
+
+
+def study(args):
+    from study import run_study, DEFAULT_QUEUE_PATH
+    results = run_study(args.patterns, args.sizes, args.wrap, args.max_generations,
+                        args.queue or DEFAULT_QUEUE_PATH, args.workers, args.output,
+                        quiet=args.json)
+    if args.json:
+        print(json.dumps(results))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Block cellular automaton batch jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_grid_options(sub, percentage=True):
+        sub.add_argument("--size", type=parse_size, default=(100, 100), help="HEIGHTxWIDTH")
+        sub.add_argument("--no-wrap", dest="wrap", action="store_false",
+                         help="disable wrap-around boundaries")
+        if percentage:
+            sub.add_argument("--pattern", choices=PATTERNS, help="start from a pattern")
+            sub.add_argument("--rle", help="start from an RLE pattern file, centered")
+            sub.add_argument("--percentage", type=int, default=50,
+                             help="random start with this percentage of black cells")
+            sub.add_argument("--seed", type=int, help="seed of the random start")
+
+    sub = commands.add_parser("simulate", help="run a simulation")
+    add_grid_options(sub)
+    sub.add_argument("--generations", type=int, default=250)
+    sub.add_argument("--renderer", choices=["none", "terminal", "gui"], default="none")
+    sub.add_argument("--pause", type=float, default=0.0, help="seconds between frames")
+    sub.add_argument("--output", help="save the final grid as .npy")
+    sub.add_argument("--metrics", help="directory for per-generation statistics (renderer none)")
+    sub.set_defaults(func=simulate)
+
+    sub = commands.add_parser("analyze", help="cycle periods of the built-in patterns")
+    sub.add_argument("--max-generations", type=int, default=100)
+    sub.add_argument("--wrap-modes", type=parse_wrap_modes,
+                     default=[True, False], help="comma-separated: wrap,no-wrap")
+    sub.add_argument("--no-cache", action="store_true", help="do not use the result cache")
+    sub.add_argument("--cache", help="result cache path")
+    sub.add_argument("--json", action="store_true", help="print results as JSON")
+    sub.set_defaults(func=analyze)
+
+    sub = commands.add_parser("sweep", help="cycle detection over random starts")
+    add_grid_options(sub, percentage=False)
+    sub.add_argument("--percentages", type=parse_int_list, default=[25, 50, 75])
+    sub.add_argument("--seeds", type=int, default=4, help="seeds 0..N-1 per percentage")
+    sub.add_argument("--generations", type=int, default=200)
+    sub.add_argument("--json", action="store_true", help="print results as JSON")
+    sub.set_defaults(func=sweep)
+
+    sub = commands.add_parser("export", help="save the grid at chosen generations")
+    add_grid_options(sub)
+    sub.add_argument("--generations", type=parse_int_list, required=True,
+                     help="comma-separated generation numbers")
+    sub.add_argument("--max-frames", type=int, default=100000,
+                     help="frames to simulate while looking for a cycle")
+    sub.add_argument("--output", required=True, help=".npz file")
+    sub.set_defaults(func=export)
+
+    sub = commands.add_parser("study", help="cycle period versus torus size")
+    sub.add_argument("--patterns", type=parse_pattern_list,
+                     help="comma-separated pattern names, default all")
+    sub.add_argument("--sizes", type=parse_size_list,
+                     help="comma-separated HEIGHTxWIDTH, default 8x8,8x9,...,24x25")
+    sub.add_argument("--no-wrap", dest="wrap", action="store_false",
+                     help="disable wrap-around boundaries")
+    sub.add_argument("--max-generations", type=int, default=1000000)
+    sub.add_argument("--queue", help="job queue path; rerun with the same path to resume")
+    sub.add_argument("--workers", type=int, help="worker processes, default one per CPU")
+    sub.add_argument("--output", help="save the result table as CSV")
+    sub.add_argument("--json", action="store_true", help="print results as JSON")
+    sub.set_defaults(func=study)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+from engine import get_engine, reference_block
+from playback import play
+from random_init import random_grid
+from rendering import PyramidRenderer, PYRAMID_THRESHOLD
+from terminal import is_headless, run_in_terminal
 
 class GlidersAutomaton:
     def __init__(self):
@@ -8,8 +11,13 @@ class GlidersAutomaton:
         self.width = 100
         self.max_generations = 250
         self.pause_time = 0.05
+        self.seed = None  # Seed for the initial grid (None = fresh entropy each run)
+        self.renderer = None  # Downsampling renderer, created for grids larger than the screen
+        self.terminal = False  # Draw in the terminal instead of a matplotlib window
+        self.backend = None  # Engine backend name to force (None = fastest for the grid)
     
-    def initialize_central_random_area(self, height=100, width=100, size_ratio=0.3, probability=0.5):
+    def initialize_central_random_area(self, height=100, width=100, size_ratio=0.3, probability=0.5,
+                                       seed=None):
         """
         Initialize grid with random cells in the center 
         
@@ -17,8 +25,9 @@ class GlidersAutomaton:
         - height, width: dimensions of the matrix
         - size_ratio: ratio of the center area to the whole grid
         - probability: probability of a cell being alive
+        - seed: seed for a reproducible grid (int or np.random.SeedSequence)
         """
-        df = np.zeros((height, width))
+        df = np.zeros((height, width), dtype=np.uint8)
         
         # Calculate center area size
         center_size_h = int(height * size_ratio)
@@ -27,10 +36,8 @@ class GlidersAutomaton:
         start_w = (width - center_size_w) // 2
         
         # Fill center with random values
-        df[start_h:start_h+center_size_h, start_w:start_w+center_size_w] = np.random.choice(
-            [0, 1], 
-            size=(center_size_h, center_size_w), 
-            p=[1-probability, probability]
+        df[start_h:start_h+center_size_h, start_w:start_w+center_size_w] = random_grid(
+            center_size_h, center_size_w, probability, seed
         )
         
         generation = 1
@@ -44,27 +51,7 @@ class GlidersAutomaton:
         """
         if i+1 >= len(df) or j+1 >= len(df[0]):
             return  # Avoid index out of bounds
-            
-        count_ones = df[i, j] + df[i, j+1] + df[i+1, j] + df[i+1, j+1]
-        
-        if count_ones == 2:
-            pass  # Continue without changes
-        elif count_ones in (0, 1, 4):
-            # Flip all bits in the 2x2 block
-            df[i, j] = (df[i, j] + 1) % 2
-            df[i, j+1] = (df[i, j+1] + 1) % 2
-            df[i+1, j] = (df[i+1, j] + 1) % 2
-            df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-        elif count_ones == 3:
-            # Flip all bits and then swap diagonally
-            df[i, j] = (df[i, j] + 1) % 2
-            df[i, j+1] = (df[i, j+1] + 1) % 2
-            df[i+1, j] = (df[i+1, j] + 1) % 2
-            df[i+1, j+1] = (df[i+1, j+1] + 1) % 2
-            
-            # Swap diagonals
-            df[i, j], df[i+1, j+1] = df[i+1, j+1], df[i, j]
-            df[i+1, j], df[i, j+1] = df[i, j+1], df[i+1, j]
+        reference_block(df, i, i+1, j, j+1)
 
     def automaton_logic_wrapped(self, df, i, j):
         """
@@ -73,31 +60,7 @@ class GlidersAutomaton:
         Parameters: df (np.ndarray): Grid, i (int): Row index, j (int): Column index
         """
         height, width = df.shape
-        
-        # Get the wrapped indices for the 2x2 block
-        i1, i2 = i % height, (i + 1) % height
-        j1, j2 = j % width, (j + 1) % width
-        
-        count_ones = df[i1, j1] + df[i1, j2] + df[i2, j1] + df[i2, j2]
-        
-        if count_ones == 2:
-            pass  # Continue without changes
-        elif count_ones in (0, 1, 4):
-            # Flip all bits in the 2x2 block
-            df[i1, j1] = (df[i1, j1] + 1) % 2
-            df[i1, j2] = (df[i1, j2] + 1) % 2
-            df[i2, j1] = (df[i2, j1] + 1) % 2
-            df[i2, j2] = (df[i2, j2] + 1) % 2
-        elif count_ones == 3:
-            # Flip all bits and then swap diagonally
-            df[i1, j1] = (df[i1, j1] + 1) % 2
-            df[i1, j2] = (df[i1, j2] + 1) % 2
-            df[i2, j1] = (df[i2, j1] + 1) % 2
-            df[i2, j2] = (df[i2, j2] + 1) % 2
-            
-            # Swap diagonals
-            df[i1, j1], df[i2, j2] = df[i2, j2], df[i1, j1]
-            df[i2, j1], df[i1, j2] = df[i1, j2], df[i2, j1]
+        reference_block(df, i % height, (i + 1) % height, j % width, (j + 1) % width)
 
     def odd_gen(self, df):
         """
@@ -105,13 +68,7 @@ class GlidersAutomaton:
         Parameters: df (np.ndarray): Grid
         """
         height, width = df.shape
-        df_copy = df.copy()
-        
-        for i in range(0, height-1, 2):
-            for j in range(0, width-1, 2):
-                self.automaton_logic(df_copy, i, j)
-        
-        df[:] = df_copy[:]
+        get_engine(height, width, False, self.backend).step(df, 1)
 
     def even_gen(self, df, wrap_around):
         """ 
@@ -119,26 +76,7 @@ class GlidersAutomaton:
         Parameters: df (np.ndarray): Grid, wrap_around (bool): Whether to apply wrap-around logic at borders
         """
         height, width = df.shape
-        df_copy = df.copy()
-        
-        for i in range(1, height-1, 2):
-            for j in range(1, width-1, 2):
-                self.automaton_logic(df_copy, i, j)
-                
-        if wrap_around:
-            i = height - 1
-            for j in range(1, width-1, 2):
-                self.automaton_logic_wrapped(df_copy, i, j)
-                
-            # Handle right-left wrapping
-            j = width - 1
-            for i in range(1, height-1, 2):
-                self.automaton_logic_wrapped(df_copy, i, j)
-                
-            # Handle corner wrapping (bottom-right corner)
-            self.automaton_logic_wrapped(df_copy, height-1, width-1)
-        
-        df[:] = df_copy[:]
+        get_engine(height, width, wrap_around, self.backend).step(df, 2)
 
     def display_automaton(self, df, generation, fig, ax, img, pause_time=0.5):
         """
@@ -152,11 +90,19 @@ class GlidersAutomaton:
         Returns:
             tuple: Updated image object for animation
             """
-        ax.clear()
-        img = ax.imshow(df, cmap='binary', vmin=0, vmax=1)
-        ax.set_title(f'Generation: {generation}')
-        ax.set_xticks([])
-        ax.set_yticks([])
+        import matplotlib.pyplot as plt
+        if max(df.shape) > PYRAMID_THRESHOLD:
+            # Draw a screen-sized downsampled view instead of the full grid
+            if self.renderer is None or self.renderer.ax is not ax:
+                ax.clear()
+                self.renderer = PyramidRenderer(ax)
+            img = self.renderer.draw(df, f'Generation: {generation}')
+        else:
+            ax.clear()
+            img = ax.imshow(df, cmap='binary', vmin=0, vmax=1)
+            ax.set_title(f'Generation: {generation}')
+            ax.set_xticks([])
+            ax.set_yticks([])
         
         # Force the figure to update
         fig.canvas.draw()
@@ -193,10 +139,17 @@ class GlidersAutomaton:
             height, 
             width, 
             size_ratio=0.3,  # Size of the central random area
-            probability=0.6   # Slightly higher chance of live cells
+            probability=0.6,  # Slightly higher chance of live cells
+            seed=self.seed
         )
         
+        if self.terminal or is_headless():
+            run_in_terminal(df, generation, wrap_around, self.odd_gen, self.even_gen,
+                            self.max_generations, self.pause_time)
+            return
+        
         # Set up the plot for visualization
+        import matplotlib.pyplot as plt
         fig, ax = plt.subplots(figsize=(10, 10))
         img = ax.imshow(df, cmap='binary')
         ax.set_xticks([])
@@ -205,16 +158,13 @@ class GlidersAutomaton:
         max_generations = self.max_generations
         pause_time = self.pause_time  
         
-        for i in range(max_generations):
-            if generation % 2 == 1:
-                self.odd_gen(df)
-            else:
-                self.even_gen(df, wrap_around)
-            generation += 1
-            
-            # Update visualization
+        def display(df, generation, pause_time):
             self.display_automaton(df, generation, fig, ax, img, pause_time)
         
+        # Keyboard: space pause, left/right step, b reverse, up/down speed, e edit (click toggles)
+        play(df, generation, wrap_around, self.odd_gen, self.even_gen, display, fig,
+             pause_time, max_generations)
+        
         plt.draw()
         plt.pause(3)
         plt.close(fig)
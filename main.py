@@ -1,8 +1,6 @@
 import os
+import sys
 import time
-from Cellular_automaton_Basic import CellularAutomatonBasic
-from gliders100 import GlidersAutomaton
-from BehaviorsAndCycles import main as interesting_main
 
 def clear_screen():
     """Clear the console screen."""
@@ -27,6 +25,7 @@ def main():
         
         if choice == '1':
             # Run basic cellular automaton
+            from Cellular_automaton_Basic import CellularAutomatonBasic
             basic_automaton = CellularAutomatonBasic()
             basic_automaton.run()
             print("\nReturning to menu...")
@@ -34,6 +33,7 @@ def main():
             
         elif choice == '2':
             # Run gliders automaton
+            from gliders100 import GlidersAutomaton
             gliders_automaton = GlidersAutomaton()
             gliders_automaton.run()
             print("\nReturning to menu...")
@@ -41,6 +41,7 @@ def main():
             
         elif choice == '3':
             # Run interesting behavior automaton
+            from BehaviorsAndCycles import main as interesting_main
             interesting_main()
             print("\nReturning to menu...")
             time.sleep(2)
@@ -56,4 +57,9 @@ def main():
             time.sleep(2)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # Batch mode: python main.py simulate|analyze|sweep|export ...
+        from cli import main as cli_main
+        cli_main(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
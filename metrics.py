@@ -0,0 +1,115 @@
+import os
+import glob
+import numpy as np
+from engine import BLOCK_RULE
+
+# Number of live cells in each 2x2 block code, before and after the rule is applied
+BLOCK_POPCOUNT = np.array([bin(code).count("1") for code in range(16)], dtype=np.int64)
+LIVE_CHANGE = BLOCK_POPCOUNT[BLOCK_RULE] - BLOCK_POPCOUNT
+
+# Which branch of automaton_logic each block code takes
+BRANCHES = ("unchanged", "flip", "flip_swap")
+BRANCH_OF_CODE = np.array([0 if count == 2 else 2 if count == 3 else 1
+                           for count in BLOCK_POPCOUNT], dtype=np.intp)
+
+# Columns written per chunk, each a separate .npy file
+COLUMNS = ("generation", "density", "histogram", "branch_fractions", "entropy")
+
+DEFAULT_CHUNK_ROWS = 4096
+
+
+def block_entropy(histogram):
+    """Shannon entropy (bits) of the 2x2 block code distribution."""
+    total = histogram.sum()
+    if total == 0:
+        return 0.0
+    p = histogram[histogram > 0] / total
+    return float(-(p * np.log2(p)).sum())
+
+
+class MetricsRecorder:
+    """
+    Per-generation statistics computed from the block-code histogram of the step kernel.
+
+    The kernels (engine backends, streaming.stream_step) count the code of
+    every block they update; from those 16 numbers alone we get the branch fractions and block
+    entropy, and the live-cell count is carried forward from the change each code causes, so the
+    grid is never scanned again. Rows are buffered and appended to directory as column chunks
+    (generation.00000.npy, density.00000.npy, ...); read them back with load_metrics.
+    """
+
+    def __init__(self, directory, df, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Parameters:
+        - directory: output directory, created if needed
+        - df: initial grid (counted once for the starting density)
+        - chunk_rows: generations buffered before a chunk is written
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self.n_cells = df.size
+        self.live = int(np.count_nonzero(df))
+        self.chunk_index = len(glob.glob(os.path.join(directory, "generation.*.npy")))
+        self._allocate()
+
+    def _allocate(self):
+        self.buffer = {
+            "generation": np.zeros(self.chunk_rows, dtype=np.int64),
+            "density": np.zeros(self.chunk_rows, dtype=np.float64),
+            "histogram": np.zeros((self.chunk_rows, 16), dtype=np.int64),
+            "branch_fractions": np.zeros((self.chunk_rows, len(BRANCHES)), dtype=np.float64),
+            "entropy": np.zeros(self.chunk_rows, dtype=np.float64),
+        }
+        self.rows = 0
+
+    def new_histogram(self):
+        """Zeroed histogram to pass to the step kernel for the next generation."""
+        return np.zeros(16, dtype=np.int64)
+
+    def record(self, generation, histogram):
+        """
+        Add the statistics of one update.
+
+        Parameters: generation (int): generation number after the update,
+                    histogram (np.ndarray): block codes counted by the kernel during the update
+        """
+        self.live += int(histogram @ LIVE_CHANGE)
+        branch_counts = np.bincount(BRANCH_OF_CODE, weights=histogram, minlength=len(BRANCHES))
+        total = histogram.sum()
+
+        row = self.rows
+        self.buffer["generation"][row] = generation
+        self.buffer["density"][row] = self.live / self.n_cells
+        self.buffer["histogram"][row] = histogram
+        self.buffer["branch_fractions"][row] = branch_counts / total if total else 0.0
+        self.buffer["entropy"][row] = block_entropy(histogram)
+        self.rows += 1
+        if self.rows == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as a new chunk."""
+        if self.rows == 0:
+            return
+        for column in COLUMNS:
+            path = os.path.join(self.directory, f"{column}.{self.chunk_index:05d}.npy")
+            np.save(path, self.buffer[column][:self.rows])
+        self.chunk_index += 1
+        self._allocate()
+
+    def close(self):
+        self.flush()
+
+
+def load_metrics(directory):
+    """
+    Read every chunk written by MetricsRecorder.
+
+    Returns: dict {column name: np.ndarray with one row per recorded generation}
+    """
+    metrics = {}
+    for column in COLUMNS:
+        paths = sorted(glob.glob(os.path.join(directory, f"{column}.*.npy")))
+        metrics[column] = np.concatenate([np.load(path) for path in paths]) if paths else None
+    return metrics
@@ -0,0 +1,265 @@
+import os
+import tempfile
+import numpy as np
+from engine import BLOCK_RULE, block_schedule
+
+# Above this many bytes the visited bitset lives in a memory-mapped temp file
+BITSET_MEMMAP_BYTES = 256 * 1024 * 1024
+
+# Largest grid sampled with a visited bitset (a 2 GiB sparse file at 34 cells). Beyond it nearly
+# every walked state lands on a fresh page of the file, so marking costs a page fault per state
+BITSET_MAX_CELLS = 34
+
+# Largest grid enumerated exhaustively: the census holds about 20 bytes per state (permutation,
+# labels, pointer-doubling temporaries and the cycle-size count), 640 MiB at 25 cells
+CENSUS_MAX_CELLS = 25
+
+# States processed per chunk when building the exhaustive permutation table
+CHUNK_STATES = 1 << 20
+
+
+def pack_state(df):
+    """
+    Pack a grid of 0/1 cells into an integer, cell (r, c) at bit r*width + c.
+
+    Parameters: df (np.ndarray): Grid with at most 64 cells
+
+    Returns: int: Packed state
+    """
+    bits = np.asarray(df).astype(np.uint64).ravel()
+    weights = np.left_shift(np.uint64(1), np.arange(bits.size, dtype=np.uint64))
+    return int(np.bitwise_or.reduce(bits * weights)) if bits.size else 0
+
+
+def unpack_state(state, height, width):
+    """
+    Unpack an integer state produced by pack_state back into a grid.
+
+    Parameters: state (int), height (int), width (int)
+
+    Returns: np.ndarray: Grid of 0/1 cells (uint8)
+    """
+    shifts = np.arange(height * width, dtype=np.uint64)
+    cells = (np.uint64(state) >> shifts) & np.uint64(1)
+    return cells.astype(np.uint8).reshape(height, width)
+
+
+def step_packed(states, height, width, schedule):
+    """
+    Apply one generation to many packed states at once using integer bit operations.
+
+    Parameters:
+    - states: np.ndarray of uint64 packed states (updated copy is returned)
+    - height, width: grid dimensions
+    - schedule: block list from block_schedule
+
+    Returns: np.ndarray: Packed states after the generation
+    """
+    states = np.array(states, dtype=np.uint64, copy=True)
+    rule = BLOCK_RULE.astype(np.uint64)
+    one = np.uint64(1)
+    for i1, i2, j1, j2 in schedule:
+        positions = [np.uint64(i1*width + j1), np.uint64(i1*width + j2),
+                     np.uint64(i2*width + j1), np.uint64(i2*width + j2)]
+        code = ((states >> positions[0]) & one)
+        code |= ((states >> positions[1]) & one) << np.uint64(1)
+        code |= ((states >> positions[2]) & one) << np.uint64(2)
+        code |= ((states >> positions[3]) & one) << np.uint64(3)
+        new_code = rule[code]
+        states &= ~((one << positions[0]) | (one << positions[1]) |
+                    (one << positions[2]) | (one << positions[3]))
+        for bit, pos in enumerate(positions):
+            states |= ((new_code >> np.uint64(bit)) & one) << pos
+    return states
+
+
+def double_step_packed(states, height, width, wrap_around):
+    """
+    Apply an odd generation followed by an even one.
+    The pair is a bijection of the state space, so it is the permutation whose orbits we count.
+    """
+    states = step_packed(states, height, width, block_schedule(height, width, wrap_around, True))
+    return step_packed(states, height, width, block_schedule(height, width, wrap_around, False))
+
+
+def make_bitset(n_bits):
+    """
+    Allocate a zeroed bitset, memory-mapped to a temp file when it is large.
+
+    Parameters: n_bits (int)
+
+    Returns: np.ndarray (uint8) with one bit per state
+    """
+    n_bytes = (n_bits + 7) // 8
+    if n_bytes <= BITSET_MEMMAP_BYTES:
+        return np.zeros(n_bytes, dtype=np.uint8)
+    fd, path = tempfile.mkstemp(suffix=".bitset")
+    os.close(fd)
+    bitset = np.memmap(path, dtype=np.uint8, mode="w+", shape=(n_bytes,))
+    os.unlink(path)  # The mapping keeps the file alive until it is released
+    # Plain ndarray view: memmap.__getitem__ adds a large per-call cost to fancy indexing
+    return bitset.view(np.ndarray)
+
+
+def _test_bits(bitset, states):
+    """Return a mask of which states are marked in the bitset."""
+    byte_index = (states >> np.uint64(3)).astype(np.int64)
+    masks = np.left_shift(np.uint8(1), (states & np.uint64(7)).astype(np.uint8))
+    return (bitset[byte_index] & masks) != 0
+
+
+def _set_bits(bitset, states):
+    """Mark states in the bitset."""
+    byte_index = (states >> np.uint64(3)).astype(np.int64)
+    masks = np.left_shift(np.uint8(1), (states & np.uint64(7)).astype(np.uint8))
+    # ufunc.at is very slow on memmaps, so merge masks sharing a byte and write each byte once
+    order = np.argsort(byte_index, kind="stable")
+    byte_index, masks = byte_index[order], masks[order]
+    unique_index, first = np.unique(byte_index, return_index=True)
+    if unique_index.size:
+        merged = np.bitwise_or.reduceat(masks, first)
+        bitset[unique_index] = bitset[unique_index] | merged
+
+
+def orbit_census(height, width, wrap_around=True):
+    """
+    Exhaustively decompose the state space of a small grid into cycles.
+
+    Builds the permutation table of the odd+even double step, then labels every state with the
+    smallest state on its cycle by pointer doubling, so no Python-level loop touches single states.
+
+    Parameters: height, width (int): at most CENSUS_MAX_CELLS cells in total, wrap_around (bool)
+
+    Returns: dict: {period in generations: number of cycles with that period}
+    """
+    n_cells = height * width
+    if n_cells > CENSUS_MAX_CELLS:
+        raise ValueError(f"Exhaustive census supports at most {CENSUS_MAX_CELLS} cells, "
+                         f"use sample_orbits instead")
+    n_states = 1 << n_cells
+
+    perm = np.empty(n_states, dtype=np.uint32)
+    for start in range(0, n_states, CHUNK_STATES):
+        stop = min(start + CHUNK_STATES, n_states)
+        chunk = np.arange(start, stop, dtype=np.uint64)
+        perm[start:stop] = double_step_packed(chunk, height, width, wrap_around)
+
+    # After k rounds label[s] is the minimum over the next 2^k states of the orbit of s
+    label = np.arange(n_states, dtype=np.uint32)
+    jump = perm
+    for _ in range(n_cells):
+        label = np.minimum(label, label[jump])
+        jump = jump[jump]
+
+    cycle_sizes = np.bincount(label, minlength=n_states)
+    cycle_sizes = cycle_sizes[cycle_sizes > 0]
+    periods, counts = np.unique(cycle_sizes, return_counts=True)
+    return {int(p) * 2: int(c) for p, c in zip(periods, counts)}
+
+
+def sample_orbits(height, width, wrap_around=True, samples=1000, max_period=100000,
+                  batch_size=256, seed=None):
+    """
+    Estimate the cycle-length distribution of a grid too large to enumerate.
+
+    Random start states are walked in batches until each returns to itself. A walker that reaches
+    the start of another live walker, or of a cycle counted in an earlier batch, is on that cycle
+    and is dropped, so every cycle is counted once. On grids up to BITSET_MAX_CELLS cells every
+    walked state is also marked in a visited bitset, so later starts on a measured cycle are
+    skipped without walking.
+
+    Parameters:
+    - height, width: grid dimensions (at most 64 cells)
+    - wrap_around: whether to use wrap-around boundary conditions
+    - samples: number of random start states
+    - max_period: orbits longer than this many double steps are reported as unresolved
+    - batch_size: start states walked together
+    - seed: seed for the random start states
+
+    Returns:
+    - periods: dict {period in generations: number of distinct cycles found}
+    - unresolved: number of orbits longer than max_period
+    """
+    n_cells = height * width
+    if n_cells > 64:
+        raise ValueError("Packed states support at most 64 cells")
+    rng = np.random.default_rng(seed)
+    visited = make_bitset(1 << n_cells) if n_cells <= BITSET_MAX_CELLS else None
+
+    periods = {}
+    unresolved = 0
+    # Sorted starts of the cycles counted (or given up on) in earlier batches
+    known = np.empty(0, dtype=np.uint64)
+    for batch_start in range(0, samples, batch_size):
+        count = min(batch_size, samples - batch_start)
+        starts = np.unique(rng.integers(0, 1 << n_cells, size=count, dtype=np.uint64))
+        if visited is not None:
+            starts = starts[~_test_bits(visited, starts)]
+            _set_bits(visited, starts)
+        starts = starts[~np.isin(starts, known)]
+        if starts.size == 0:
+            continue
+
+        current = starts.copy()
+        active = np.ones(starts.size, dtype=bool)
+        dropped = np.zeros(starts.size, dtype=bool)
+        steps = 0
+        while active.any() and steps < max_period:
+            current[active] = double_step_packed(current[active], height, width, wrap_around)
+            steps += 1
+
+            returned = active & (current == starts)
+            if returned.any():
+                period = steps * 2
+                periods[period] = periods.get(period, 0) + int(returned.sum())
+                active &= ~returned
+
+            walkers = np.flatnonzero(active)
+            if known.size:
+                on_known = np.isin(current[walkers], known)
+                active[walkers[on_known]] = False
+                dropped[walkers[on_known]] = True
+                walkers = walkers[~on_known]
+
+            # starts is sorted, so a hit on another walker's start is a binary search away
+            owners = np.searchsorted(starts, current[walkers])
+            owners = np.minimum(owners, starts.size - 1)
+            hits = starts[owners] == current[walkers]
+            for walker, owner in zip(walkers[hits], owners[hits]):
+                if not dropped[owner]:
+                    active[walker] = False
+                    dropped[walker] = True
+
+            if visited is not None:
+                _set_bits(visited, current[active])
+        unresolved += int(active.sum())
+        known = np.union1d(known, starts[~dropped])
+    return periods, unresolved
+
+
+def print_orbit_table(periods, unresolved=0):
+    """Print a cycle-length distribution as a table."""
+    print("Period (generations) | Cycles")
+    print("---------------------|-------")
+    for period in sorted(periods):
+        print(f"{str(period).ljust(21)}| {periods[period]}")
+    if unresolved:
+        print(f"{unresolved} sampled orbits did not close within the generation cap")
+
+
+def run_orbit_analysis(height=4, width=4, wrap_around=True, samples=1000, max_period=100000):
+    """
+    Analyze the full orbit structure of a small grid.
+    Grids up to CENSUS_MAX_CELLS cells are enumerated exhaustively, larger ones (up to 64 cells)
+    are sampled, following each sampled orbit for at most max_period double steps.
+    """
+    print(f"\nOrbit structure of a {height}x{width} grid, wrap-around={wrap_around}:")
+    if height * width <= CENSUS_MAX_CELLS:
+        periods = orbit_census(height, width, wrap_around)
+        print_orbit_table(periods)
+    else:
+        print(f"Sampling {samples} start states; orbits longer than {2 * max_period} "
+              f"generations are reported as unresolved")
+        periods, unresolved = sample_orbits(height, width, wrap_around, samples, max_period)
+        print_orbit_table(periods, unresolved)
+    return periods
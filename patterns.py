@@ -0,0 +1,374 @@
+import os
+import re
+import io
+import numpy as np
+from functools import lru_cache
+
+# Bytes of RLE body decoded per chunk
+RLE_CHUNK_BYTES = 1 << 20
+
+# Rows encoded per band when writing RLE
+RLE_BAND_ROWS = 1024
+
+# Maximum RLE line length, as written by Golly
+RLE_LINE_LENGTH = 70
+
+# Catalog file layout: header, bit-packed pattern rows, then the index
+CATALOG_MAGIC = b"CAPL"
+CATALOG_VERSION = 1
+CATALOG_HEADER = np.dtype([("magic", "S4"), ("version", "<u4"), ("count", "<u8"),
+                           ("index_offset", "<u8")])
+CATALOG_INDEX = np.dtype([("name", "S64"), ("height", "<u4"), ("width", "<u4"),
+                          ("offset", "<u8")])
+
+# Patterns of BehaviorsAndCycles, as RLE
+BUILTIN_RLE = {
+    "blinker": "x = 3, y = 3\nbo$bo$bo!",
+    "traffic_light": "x = 4, y = 4\nb2o$o2bo$o2bo$b2o!",
+    "small_oscillator": "x = 2, y = 2\no$bo!",
+    "zigzag_glider": "x = 3, y = 3\nbo$obo$bo!",
+    "plus_shape": "x = 5, y = 5\n2bo$2bo$5o$2bo$2bo!",
+    "square_shape": "x = 5, y = 5\n5o$o3bo$o3bo$o3bo$5o!",
+    "x_shape": "x = 5, y = 5\no3bo$bobo$2bo$bobo$o3bo!",
+    "single_cell": "x = 1, y = 1\no!",
+}
+
+_HEADER = re.compile(rb"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)")
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b" \t\r\n")] = True
+_DEAD_TAGS = np.zeros(256, dtype=bool)
+_DEAD_TAGS[list(b"b.")] = True
+_VALID_TAGS = np.zeros(256, dtype=bool)
+_VALID_TAGS[list(b"$.ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")] = True
+
+
+def packed_width(width):
+    """Bytes per bit-packed row."""
+    return (width + 7) // 8
+
+
+def unpack_grid(packed, width):
+    """Turn a bit-packed grid (little bit order, as produced here) back into 0/1 uint8 cells."""
+    return np.unpackbits(packed, axis=1, count=width, bitorder="little")
+
+
+def pack_grid(df):
+    """Bit-pack the rows of a 0/1 grid, little bit order."""
+    return np.packbits(np.asarray(df).astype(bool), axis=1, bitorder="little")
+
+
+def _set_runs(packed, rows, starts, lengths):
+    """
+    Set the bits of live runs in a bit-packed grid.
+
+    Parameters: packed (np.ndarray): (height, row bytes) uint8, rows, starts, lengths: one entry
+                per run of live cells
+    """
+    stops = starts + lengths
+    first, last = starts // 8, (stops - 1) // 8
+    row_base = rows * packed.shape[1]
+    flat = packed.reshape(-1)
+
+    # Bytes fully inside a run belong to that run alone
+    inner = np.maximum(last - first - 1, 0)
+    if inner.sum():
+        run_of_byte = np.repeat(np.arange(len(rows)), inner)
+        offset = np.arange(inner.sum()) - np.repeat(np.cumsum(inner) - inner, inner)
+        flat[row_base[run_of_byte] + first[run_of_byte] + 1 + offset] = 0xFF
+
+    # Partial first and last bytes may be shared with neighbouring runs
+    single = first == last
+    low = np.where(single, stops - first * 8, 8)
+    first_mask = ((1 << low) - 1) & ~((1 << (starts % 8)) - 1)
+    last_mask = (1 << (stops - last * 8)) - 1
+    index = np.concatenate([row_base + first, (row_base + last)[~single]])
+    masks = np.concatenate([first_mask, last_mask[~single]]).astype(np.uint8)
+    order = np.argsort(index, kind="stable")
+    index, masks = index[order], masks[order]
+    unique, begin = np.unique(index, return_index=True)
+    flat[unique] |= np.bitwise_or.reduceat(masks, begin) if len(masks) else masks
+
+
+def _decode_chunk(body, row, col, height, width, packed):
+    """
+    Decode a chunk of RLE body (whitespace removed, ending with a tag) into the packed grid.
+
+    Returns: (row, col) position after the chunk
+    """
+    is_digit = (body >= ord("0")) & (body <= ord("9"))
+    tag_positions = np.flatnonzero(~is_digit)
+    tags = body[tag_positions]
+    if not _VALID_TAGS[tags].all():
+        bad = tags[~_VALID_TAGS[tags]][0]
+        raise ValueError(f"Invalid character {chr(bad)!r} in RLE body")
+
+    # Run counts: the digits between the previous tag and this one, 1 if there are none
+    digit_positions = np.flatnonzero(is_digit)
+    owner = np.searchsorted(tag_positions, digit_positions)
+    power = tag_positions[owner] - digit_positions - 1
+    values = (body[digit_positions] - ord("0")).astype(np.int64) * 10 ** power.astype(np.int64)
+    counts = np.bincount(owner, weights=values, minlength=len(tags)).astype(np.int64)
+    has_digits = np.bincount(owner, minlength=len(tags)) > 0
+    counts[~has_digits] = 1
+
+    newline = tags == ord("$")
+    advance = np.where(newline, 0, counts)
+    down = counts - advance
+    before = np.cumsum(advance) - advance
+    row_of_tag = row + np.cumsum(down) - down
+    last_newline = np.maximum.accumulate(np.where(newline, np.arange(len(tags)), -1))
+    col_of_tag = np.where(last_newline >= 0, before - before[np.maximum(last_newline, 0)],
+                          col + before)
+
+    live = ~newline & ~_DEAD_TAGS[tags]
+    rows, starts, lengths = row_of_tag[live], col_of_tag[live], counts[live]
+    if len(rows):
+        if rows.max() >= height or (starts + lengths).max() > width:
+            raise ValueError(f"RLE pattern exceeds its header size {width}x{height}")
+        _set_runs(packed, rows, starts, lengths)
+
+    if not len(tags):
+        return row, col
+    if last_newline[-1] >= 0:
+        col = advance.sum() - before[last_newline[-1]]
+    else:
+        col += advance.sum()
+    return row + int(down.sum()), int(col)
+
+
+def read_rle(source, packed=False, chunk_bytes=RLE_CHUNK_BYTES):
+    """
+    Read a pattern in RLE format (as used by Golly and LifeWiki).
+
+    The body is decoded chunk by chunk with NumPy straight into a bit-packed grid; 'b' and '.'
+    are dead cells, any other letter a live one.
+
+    Parameters:
+    - source: path or binary file object (for RLE text use parse_rle)
+    - packed: return the bit-packed rows instead of 0/1 cells
+    - chunk_bytes: body bytes decoded at a time
+
+    Returns: np.ndarray (uint8): (height, width) cells, or (height, row bytes) if packed
+    """
+    stream = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        for line in stream:
+            if line.startswith(b"#") or not line.strip():
+                continue
+            header = _HEADER.match(line.strip())
+            if header is None:
+                raise ValueError(f"RLE header line expected, got {line[:40]!r}")
+            break
+        else:
+            raise ValueError("RLE input has no header line")
+        width, height = int(header.group(1)), int(header.group(2))
+        grid = np.zeros((height, packed_width(width)), dtype=np.uint8)
+
+        row, col = 0, 0
+        carry = np.zeros(0, dtype=np.uint8)
+        while True:
+            data = stream.read(chunk_bytes)
+            body = np.frombuffer(data, dtype=np.uint8)
+            body = np.concatenate([carry, body[~_WHITESPACE[body]]])
+            end = np.flatnonzero(body == ord("!"))
+            done = not data or len(end) > 0
+            if len(end):
+                body = body[:end[0]]
+            # Digits after the last tag belong to a tag in the next chunk
+            tag_positions = np.flatnonzero((body < ord("0")) | (body > ord("9")))
+            split = tag_positions[-1] + 1 if len(tag_positions) else 0
+            row, col = _decode_chunk(body[:split], row, col, height, width, grid)
+            carry = body[split:]
+            if done:
+                break
+    finally:
+        if stream is not source:
+            stream.close()
+    return grid if packed else unpack_grid(grid, width)
+
+
+def rle_tokens(df, band_rows=RLE_BAND_ROWS):
+    """
+    Generate the RLE tokens of a grid ("3o", "2b", "4$", ...), band by band.
+
+    Dead cells at the end of a row and empty rows at the end of the grid are not written.
+    """
+    height = df.shape[0]
+    current_row = 0
+    for start in range(0, height, band_rows):
+        band = np.asarray(df[start:start + band_rows]).astype(bool)
+        edges = np.diff(np.pad(band, ((0, 0), (1, 1))).view(np.int8), axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        run_stops = np.nonzero(edges == -1)[1]
+        row_begin = np.searchsorted(run_rows, np.arange(len(band)))
+        row_end = np.searchsorted(run_rows, np.arange(len(band)), side="right")
+        for r in np.flatnonzero(row_end > row_begin).tolist():
+            gap = start + r - current_row
+            if gap:
+                yield f"{gap if gap > 1 else ''}$"
+                current_row = start + r
+            previous = 0
+            for begin, stop in zip(run_starts[row_begin[r]:row_end[r]].tolist(),
+                                   run_stops[row_begin[r]:row_end[r]].tolist()):
+                if begin > previous:
+                    yield f"{begin - previous if begin - previous > 1 else ''}b"
+                yield f"{stop - begin if stop - begin > 1 else ''}o"
+                previous = stop
+
+
+def write_rle(destination, df, comment=None):
+    """
+    Write a grid in RLE format.
+
+    Parameters: destination: path or text file object, df (np.ndarray): 0/1 grid,
+                comment (str): optional '#C' comment line
+    """
+    height, width = df.shape
+    stream = open(destination, "w") if isinstance(destination, str) else destination
+    try:
+        if comment:
+            stream.write(f"#C {comment}\n")
+        stream.write(f"x = {width}, y = {height}\n")
+        line = ""
+        for token in rle_tokens(df):
+            if len(line) + len(token) > RLE_LINE_LENGTH:
+                stream.write(line + "\n")
+                line = ""
+            line += token
+        stream.write(line + "!\n")
+    finally:
+        if stream is not destination:
+            stream.close()
+
+
+def to_rle(df):
+    """RLE text of a grid."""
+    text = io.StringIO()
+    write_rle(text, df)
+    return text.getvalue()
+
+
+def parse_rle(text, packed=False):
+    """Cells of a pattern given as RLE text (see read_rle), e.g. to_rle output."""
+    return read_rle(io.BytesIO(text.encode()), packed)
+
+
+@lru_cache(maxsize=None)
+def _builtin(name):
+    pattern = parse_rle(BUILTIN_RLE[name])
+    pattern.setflags(write=False)
+    return pattern
+
+
+def builtin_pattern(name):
+    """Cells of a built-in pattern (read-only uint8 array)."""
+    if name not in BUILTIN_RLE:
+        raise ValueError(f"Unknown pattern {name!r}, choose from {sorted(BUILTIN_RLE)}")
+    return _builtin(name)
+
+
+def write_catalog(path, patterns):
+    """
+    Write many patterns to one binary catalog file.
+
+    Layout: a fixed header, every pattern's bit-packed rows back to back, then an index of
+    (name, height, width, offset) records, so a reader maps the file once and slices it.
+
+    Parameters: path (str), patterns: mapping or iterable of (name, 0/1 grid)
+    """
+    items = patterns.items() if hasattr(patterns, "items") else patterns
+    index = []
+    with open(path, "wb") as stream:
+        stream.write(bytes(CATALOG_HEADER.itemsize))
+        for name, df in items:
+            encoded = name.encode()
+            if len(encoded) > CATALOG_INDEX["name"].itemsize:
+                raise ValueError(f"Pattern name too long: {name!r}")
+            height, width = np.shape(df)
+            index.append((encoded, height, width, stream.tell()))
+            stream.write(pack_grid(df).tobytes())
+        index_offset = stream.tell()
+        stream.write(np.array(index, dtype=CATALOG_INDEX).tobytes())
+        stream.seek(0)
+        header = np.array([(CATALOG_MAGIC, CATALOG_VERSION, len(index), index_offset)],
+                          dtype=CATALOG_HEADER)
+        stream.write(header.tobytes())
+
+
+def build_catalog(path, rle_paths):
+    """Write a catalog from RLE files, each named after its file name without extension."""
+    write_catalog(path, ((os.path.splitext(os.path.basename(rle_path))[0],
+                          read_rle(rle_path)) for rle_path in rle_paths))
+
+
+class PatternCatalog:
+    """
+    Read-only view of a catalog written by write_catalog.
+
+    The file is memory-mapped; looking a pattern up reads only its index record and its rows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self.data[:CATALOG_HEADER.itemsize].view(CATALOG_HEADER)[0]
+        if header["magic"] != CATALOG_MAGIC or header["version"] != CATALOG_VERSION:
+            raise ValueError(f"{path} is not a version {CATALOG_VERSION} pattern catalog")
+        start = int(header["index_offset"])
+        stop = start + int(header["count"]) * CATALOG_INDEX.itemsize
+        self.index = self.data[start:stop].view(CATALOG_INDEX)
+        self.positions = {name.decode(): k for k, name in enumerate(self.index["name"])}
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def names(self):
+        return list(self.positions)
+
+    def packed(self, name):
+        """Bit-packed rows of a pattern, a view into the mapped file."""
+        record = self.index[self.positions[name]]
+        height, width, offset = int(record["height"]), int(record["width"]), int(record["offset"])
+        row_bytes = packed_width(width)
+        return self.data[offset:offset + height * row_bytes].reshape(height, row_bytes)
+
+    def get(self, name):
+        """Cells of a pattern as a 0/1 uint8 array."""
+        return unpack_grid(self.packed(name), int(self.index[self.positions[name]]["width"]))
+
+
+def place(df, pattern, positions, wrap_around=False, overwrite=True):
+    """
+    Stamp many copies of a pattern into a grid with one scatter.
+
+    Parameters:
+    - df: grid, changed in-place
+    - pattern: 0/1 cells of the pattern
+    - positions: (row, column) of the top-left corner of every copy, shape (n, 2)
+    - wrap_around: wrap copies around the grid edges instead of rejecting them
+    - overwrite: write the pattern's dead cells too (like slicing it in), or only set live cells
+    """
+    pattern = np.asarray(pattern)
+    positions = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+    height, width = df.shape
+    if overwrite:
+        offset_rows, offset_cols = np.indices(pattern.shape).reshape(2, -1)
+        values = pattern.reshape(-1)
+    else:
+        offset_rows, offset_cols = np.nonzero(pattern)
+        values = np.ones(len(offset_rows), dtype=pattern.dtype)
+
+    rows = positions[:, 0, None] + offset_rows
+    cols = positions[:, 1, None] + offset_cols
+    if wrap_around:
+        rows %= height
+        cols %= width
+    elif len(positions) and (positions.min() < 0 or
+                             (positions[:, 0] + pattern.shape[0]).max() > height or
+                             (positions[:, 1] + pattern.shape[1]).max() > width):
+        raise ValueError(f"A {pattern.shape[0]}x{pattern.shape[1]} pattern placed in a "
+                         f"{height}x{width} grid does not fit")
+    df[rows.reshape(-1), cols.reshape(-1)] = np.broadcast_to(values, rows.shape).reshape(-1)
@@ -0,0 +1,162 @@
+import numpy as np
+from engine import inverse_gen
+
+
+class PlaybackControls:
+    """
+    Keyboard controls for a live view.
+
+    space: pause/resume, right/left: step one generation forward/backward while paused,
+    b: toggle reverse playback, up/down: faster/slower,
+    e: toggle edit mode (pauses; a left click toggles the cell under the cursor)
+    """
+
+    def __init__(self, fig, pause_time):
+        import matplotlib.pyplot as plt
+        self.paused = False
+        self.reverse = False
+        self.pause_time = pause_time
+        self.pending_steps = 0
+        self.editing = False
+        self.pending_edits = []
+        # Free the arrow keys from the toolbar's view history navigation
+        for keymap in ("keymap.back", "keymap.forward"):
+            plt.rcParams[keymap] = [key for key in plt.rcParams[keymap]
+                                    if key not in ("left", "right")]
+        fig.canvas.mpl_connect("key_press_event", self.on_key)
+        fig.canvas.mpl_connect("button_press_event", self.on_click)
+
+    def on_key(self, event):
+        """Handle a key press on the figure."""
+        if event.key == " ":
+            self.paused = not self.paused
+        elif event.key == "right":
+            self.pending_steps += 1
+        elif event.key == "left":
+            self.pending_steps -= 1
+        elif event.key == "b":
+            self.reverse = not self.reverse
+        elif event.key == "up":
+            self.pause_time = max(self.pause_time / 2, 0.001)
+        elif event.key == "down":
+            self.pause_time = min(self.pause_time * 2, 2.0)
+        elif event.key == "e":
+            self.editing = not self.editing
+            if self.editing:
+                self.paused = True
+
+    def on_click(self, event):
+        """Queue the cell under a left click while in edit mode."""
+        if self.editing and event.button == 1 and event.inaxes is not None \
+                and event.xdata is not None:
+            self.pending_edits.append((int(round(event.ydata)), int(round(event.xdata))))
+
+    def take_edits(self):
+        """
+        Cells clicked since the last call.
+
+        Returns: np.ndarray of shape (n, 2) with (row, column) of each click
+        """
+        edits = np.array(self.pending_edits, dtype=np.intp).reshape(-1, 2)
+        self.pending_edits = []
+        return edits
+
+    def next_direction(self):
+        """
+        Direction of the next frame.
+
+        Returns: int: 1 forward, -1 backward, 0 stay (paused without pending steps)
+        """
+        if self.paused:
+            if self.pending_steps > 0:
+                self.pending_steps -= 1
+                return 1
+            if self.pending_steps < 0:
+                self.pending_steps += 1
+                return -1
+            return 0
+        return -1 if self.reverse else 1
+
+
+def toggle_cells(df, cells):
+    """
+    Flip cells of the grid in-place; a cell listed an even number of times is left as it was.
+
+    Parameters: df (np.ndarray): grid, cells (np.ndarray): (n, 2) rows and columns, cells
+                outside the grid are ignored
+
+    Returns: np.ndarray: (m, 2) rows and columns of the cells actually flipped
+    """
+    height, width = df.shape
+    cells = np.asarray(cells, dtype=np.intp).reshape(-1, 2)
+    inside = (cells[:, 0] >= 0) & (cells[:, 0] < height) & (cells[:, 1] >= 0) & (cells[:, 1] < width)
+    cells, counts = np.unique(cells[inside], axis=0, return_counts=True)
+    cells = cells[counts % 2 == 1]
+    rows, cols = cells[:, 0], cells[:, 1]
+    df[rows, cols] = 1 - df[rows, cols]
+    return cells
+
+
+def play(df, generation, wrap_around, odd_gen, even_gen, display, fig, pause_time,
+         max_generations, state_at=None, on_edit=None):
+    """
+    Run a live view with keyboard controls.
+
+    Backward frames are recomputed with inverse_gen instead of being stored, so memory stays flat
+    however long the session is. Playback ends when max_generations frames have been shown or the
+    window is closed.
+
+    Parameters:
+    - df: grid at the given generation (updated in-place)
+    - generation: generation number of df
+    - wrap_around: whether to use wrap-around boundary conditions
+    - odd_gen, even_gen: in-place forward step functions
+    - display: callable display(df, generation, pause_time) drawing a frame and pausing
+    - fig: matplotlib figure receiving the key presses
+    - pause_time: initial pause between frames
+    - max_generations: number of frames to show
+    - state_at: optional callable state_at(generation) used instead of stepping forward,
+      e.g. GenerationSeeker.state_at; it may return None for a generation it cannot answer
+    - on_edit: optional callable on_edit(df, cells, generation) called after cells were toggled
+      in edit mode, to update whatever was derived from the old state (e.g. GenerationSeeker.edit).
+      Without it, state_at is no longer used once the grid has been edited.
+
+    Returns: int: generation shown last
+    """
+    import matplotlib.pyplot as plt
+    first_generation = generation
+    controls = PlaybackControls(fig, pause_time)
+    frames = 0
+    while frames < max_generations and plt.fignum_exists(fig.number):
+        edits = controls.take_edits()
+        if len(edits):
+            # Edited in place: the next step continues from the new state in the same buffer
+            cells = toggle_cells(df, edits)
+            if on_edit is not None:
+                on_edit(df, cells, generation)
+            else:
+                state_at = None
+            display(df, generation, 0.001)
+            continue
+
+        direction = controls.next_direction()
+        if direction == 0 or (direction < 0 and generation <= first_generation):
+            plt.pause(0.05)  # Keep the window responsive while paused
+            continue
+
+        if direction > 0:
+            frame = state_at(generation + 1) if state_at is not None else None
+            if frame is not None:
+                df[:] = frame
+            elif generation % 2 == 1:
+                odd_gen(df)
+            else:
+                even_gen(df, wrap_around)
+            generation += 1
+        else:
+            generation -= 1
+            inverse_gen(df, generation, wrap_around)
+
+        display(df, generation, controls.pause_time)
+        frames += 1
+    return generation
@@ -0,0 +1,141 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Rows per band when filling a memory-mapped grid; each band has its own child seed
+BAND_ROWS = 1024
+
+
+def _lane_threshold(probability):
+    """
+    Pick the narrowest integer lane that represents the probability exactly enough.
+
+    Returns:
+    - lane_dtype: np.uint8 or np.uint16, cells drawn per lane of a 64-bit random word
+    - threshold: a lane value below it becomes a live cell
+    """
+    if not 0 <= probability <= 1:
+        raise ValueError(f"Probability must be between 0 and 1, got {probability}")
+    threshold = probability * 256
+    if threshold == int(threshold):
+        return np.uint8, int(threshold)
+    return np.uint16, int(round(probability * 65536))
+
+
+def random_cells(bit_generator, rows, width, probability):
+    """
+    Draw a rows x width block of 0/1 cells from raw 64-bit words of a bit generator.
+
+    Each word is split into 8-bit (or 16-bit) lanes compared against an integer threshold, so no
+    floats are generated. With probability 0.5 every bit of the word is used as a cell.
+    The stream is consumed row by row, so the same seed gives the same grid however it is chunked.
+
+    Parameters:
+    - bit_generator: np.random.Generator or its bit_generator
+    - rows, width: block dimensions
+    - probability: probability that a cell is 1
+
+    Returns: np.ndarray (uint8) of shape (rows, width)
+    """
+    bit_generator = getattr(bit_generator, "bit_generator", bit_generator)
+    if probability == 0.5:
+        words_per_row = -(-width // 64)
+        raw = bit_generator.random_raw(rows * words_per_row)
+        bits = np.unpackbits(raw.view(np.uint8).reshape(rows, -1), axis=1)
+        return bits[:, :width]
+
+    lane_dtype, threshold = _lane_threshold(probability)
+    lanes = 8 // np.dtype(lane_dtype).itemsize
+    words_per_row = -(-width // lanes)
+    raw = bit_generator.random_raw(rows * words_per_row)
+    values = raw.view(lane_dtype).reshape(rows, -1)[:, :width]
+    return (values < threshold).view(np.uint8)
+
+
+def random_grid(height, width, probability=0.5, seed=None, packed=False):
+    """
+    Random grid of 0/1 cells, reproducible from a seed.
+
+    Parameters:
+    - height, width: grid dimensions
+    - probability: probability that a cell is 1
+    - seed: int, SeedSequence or None for fresh entropy
+    - packed: return the grid bit-packed along rows (np.packbits, 8 cells per byte)
+
+    Returns: np.ndarray (uint8) of shape (height, width), or (height, ceil(width/8)) if packed
+    """
+    generator = np.random.default_rng(seed)
+    cells = random_cells(generator, height, width, probability)
+    if packed:
+        return np.packbits(cells, axis=1)
+    return cells
+
+
+def spawn_seeds(seed, count):
+    """
+    Independent child seeds for parallel workers.
+
+    Parameters: seed (int, SeedSequence or None), count (int)
+
+    Returns: list of np.random.SeedSequence
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(count)
+
+
+def _fill_band(path, shape, row_start, row_stop, col_start, col_stop, probability, seed_seq):
+    """Fill one band of a memory-mapped grid (runs in a worker process)."""
+    grid = np.memmap(path, dtype=np.uint8, mode="r+", shape=shape)
+    generator = np.random.default_rng(seed_seq)
+    grid[row_start:row_stop, col_start:col_stop] = random_cells(
+        generator, row_stop - row_start, col_stop - col_start, probability)
+    grid.flush()
+    del grid
+
+
+def fill_memmap(path, height, width, probability=0.5, seed=None, region=None,
+                band_rows=BAND_ROWS, workers=1):
+    """
+    Fill a region of a uint8 grid file band by band, for grids larger than RAM.
+
+    Every band of band_rows rows gets its own child seed, so the result depends only on the
+    seed and band_rows, not on the number of workers.
+
+    Parameters:
+    - path: grid file, created with the given shape if it does not exist
+    - height, width: grid dimensions
+    - probability: probability that a cell is 1
+    - seed: int, SeedSequence or None
+    - region: (row_start, row_stop, col_start, col_stop) to fill, default whole grid
+    - band_rows: rows generated per band
+    - workers: number of worker processes
+
+    Returns: np.memmap of the grid
+    """
+    mode = "r+" if _file_matches(path, height * width) else "w+"
+    grid = np.memmap(path, dtype=np.uint8, mode=mode, shape=(height, width))
+    grid.flush()
+    row_start, row_stop, col_start, col_stop = region or (0, height, 0, width)
+
+    bands = list(range(row_start, row_stop, band_rows))
+    seeds = spawn_seeds(seed, len(bands))
+    jobs = [(path, (height, width), start, min(start + band_rows, row_stop), col_start, col_stop,
+             probability, seed_seq) for start, seed_seq in zip(bands, seeds)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_fill_band, *job) for job in jobs]:
+                future.result()
+    else:
+        for job in jobs:
+            _fill_band(*job)
+    return grid
+
+
+def _file_matches(path, size):
+    """True if the file exists with exactly the given size in bytes."""
+    try:
+        return os.path.getsize(path) == size
+    except OSError:
+        return False
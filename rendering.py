@@ -0,0 +1,143 @@
+import numpy as np
+
+# Grids with a side longer than this are drawn through the pyramid renderer
+PYRAMID_THRESHOLD = 2048
+
+
+def block_mean(level):
+    """
+    Halve a density image by averaging 2x2 blocks (odd edges are padded by repeating them).
+
+    Parameters: level (np.ndarray): grid or density image
+
+    Returns: np.ndarray: float32 image of half the size
+    """
+    height, width = level.shape
+    if height % 2 or width % 2:
+        level = np.pad(level, ((0, height % 2), (0, width % 2)), mode="edge")
+    return level.reshape(level.shape[0] // 2, 2, level.shape[1] // 2, 2).mean(axis=(1, 3),
+                                                                               dtype=np.float32)
+
+
+class PyramidRenderer:
+    """
+    Draw a grid much larger than the screen at the screen's resolution.
+
+    A density pyramid is kept where level k holds the mean of 2^k x 2^k cells. Each frame the
+    coarsest level that still has at least one value per screen pixel across the current viewport
+    is drawn, so matplotlib never resamples the full grid. Zooming in far enough ends up at level 0,
+    the full-resolution cells of the visible tile.
+
+    Mouse: scroll to zoom around the cursor, drag with the right button to pan.
+    """
+
+    def __init__(self, ax, cmap='binary'):
+        self.ax = ax
+        self.cmap = cmap
+        self.levels = []
+        self.viewport = None   # (row_start, row_stop, col_start, col_stop) in cells
+        self.image = None
+        self._drag_start = None
+        canvas = ax.figure.canvas
+        canvas.mpl_connect("scroll_event", self.on_scroll)
+        canvas.mpl_connect("button_press_event", self.on_press)
+        canvas.mpl_connect("button_release_event", self.on_release)
+
+    def update(self, df):
+        """
+        Rebuild the pyramid from the grid.
+
+        Level 0 is the grid itself (no copy). Every level is recomputed: under this rule empty
+        space flips each generation, so a frame never changes just a few rows.
+
+        Parameters: df (np.ndarray): grid
+        """
+        level = df
+        self.levels = [df]
+        while max(level.shape) > 1:
+            level = block_mean(level)
+            self.levels.append(level)
+        if self.viewport is None:
+            self.viewport = (0, df.shape[0], 0, df.shape[1])
+
+    def screen_pixels(self):
+        """Size of the axes on screen in pixels (rows, cols)."""
+        extent = self.ax.get_window_extent()
+        return max(int(extent.height), 1), max(int(extent.width), 1)
+
+    def pick_level(self):
+        """Coarsest pyramid level with at least one value per screen pixel in the viewport."""
+        row_start, row_stop, col_start, col_stop = self.viewport
+        pixels_h, pixels_w = self.screen_pixels()
+        cells_per_pixel = min((row_stop - row_start) / pixels_h, (col_stop - col_start) / pixels_w)
+        level = int(np.floor(np.log2(max(cells_per_pixel, 1))))
+        return min(level, len(self.levels) - 1)
+
+    def draw(self, df=None, title=None):
+        """
+        Draw the viewport, rebuilding the pyramid first if a new grid is given.
+
+        Parameters: df (np.ndarray or None): new grid state, title (str or None): axes title
+        """
+        if df is not None:
+            self.update(df)
+        level = self.pick_level()
+        scale = 2 ** level
+        row_start, row_stop, col_start, col_stop = self.viewport
+        tile = self.levels[level][row_start // scale:-(-row_stop // scale),
+                                  col_start // scale:-(-col_stop // scale)]
+        # Extent in cell coordinates of the (possibly coarse) tile
+        extent = (col_start // scale * scale - 0.5, -(-col_stop // scale) * scale - 0.5,
+                  -(-row_stop // scale) * scale - 0.5, row_start // scale * scale - 0.5)
+        if self.image is None or self.image.axes is not self.ax or self.image not in self.ax.images:
+            self.image = self.ax.imshow(tile, cmap=self.cmap, vmin=0, vmax=1,
+                                        interpolation='nearest', extent=extent)
+        else:
+            self.image.set_data(tile)
+            self.image.set_extent(extent)
+        self.ax.set_xlim(col_start - 0.5, col_stop - 0.5)
+        self.ax.set_ylim(row_stop - 0.5, row_start - 0.5)
+        if title is not None:
+            self.ax.set_title(title)
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        return self.image
+
+    def zoom(self, factor, center_row, center_col):
+        """Zoom the viewport by factor (< 1 zooms in) around a cell position."""
+        height, width = self.levels[0].shape
+        row_start, row_stop, col_start, col_stop = self.viewport
+        new_h = int(np.clip((row_stop - row_start) * factor, 8, height))
+        new_w = int(np.clip((col_stop - col_start) * factor, 8, width))
+        row_start = int(np.clip(center_row - new_h / 2, 0, height - new_h))
+        col_start = int(np.clip(center_col - new_w / 2, 0, width - new_w))
+        self.viewport = (row_start, row_start + new_h, col_start, col_start + new_w)
+
+    def pan(self, d_row, d_col):
+        """Move the viewport by a number of cells, clamped to the grid."""
+        height, width = self.levels[0].shape
+        row_start, row_stop, col_start, col_stop = self.viewport
+        d_row = int(np.clip(d_row, -row_start, height - row_stop))
+        d_col = int(np.clip(d_col, -col_start, width - col_stop))
+        self.viewport = (row_start + d_row, row_stop + d_row, col_start + d_col, col_stop + d_col)
+
+    def on_scroll(self, event):
+        if event.inaxes is not self.ax or not self.levels:
+            return
+        self.zoom(0.5 if event.button == 'up' else 2.0, event.ydata, event.xdata)
+        self.draw()
+        self.ax.figure.canvas.draw_idle()
+
+    def on_press(self, event):
+        if event.inaxes is self.ax and event.button == 3:
+            self._drag_start = (event.ydata, event.xdata)
+
+    def on_release(self, event):
+        if self._drag_start is None or event.inaxes is not self.ax or not self.levels:
+            self._drag_start = None
+            return
+        start_row, start_col = self._drag_start
+        self._drag_start = None
+        self.pan(start_row - event.ydata, start_col - event.xdata)
+        self.draw()
+        self.ax.figure.canvas.draw_idle()
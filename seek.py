@@ -0,0 +1,198 @@
+import numpy as np
+from engine import Fingerprint, FINGERPRINT_SIZE, get_engine
+
+
+class GenerationSeeker:
+    """
+    Answer "what does the grid look like at generation N" without re-simulating from generation 1.
+
+    Frames are simulated once, bit-packed and cached. As soon as a state repeats at a generation of
+    the same parity (odd and even generations use different block partitions, so only those repeats
+    are exact cycles) the cycle is recorded, and any later generation maps onto a cached frame.
+    """
+
+    def __init__(self, df, wrap_around, odd_gen, even_gen, generation=1, max_frames=100000):
+        """
+        Parameters:
+        - df: grid at the starting generation (not modified)
+        - wrap_around: whether to use wrap-around boundary conditions
+        - odd_gen, even_gen: in-place step functions, e.g. BehaviorsAndCycles.odd_gen/even_gen
+        - generation: generation number of df
+        - max_frames: cap on cached frames while no cycle has been found
+        """
+        self.wrap_around = wrap_around
+        self.odd_gen = odd_gen
+        self.even_gen = even_gen
+        self.first_generation = generation
+        self.max_frames = max_frames
+        self.shape = df.shape
+        self.dtype = df.dtype
+
+        self.frames = []          # packed frame for generation first_generation + index
+        self.seen = {}            # (packed bytes, parity) -> frame index
+        self.period = 0
+        self.cycle_start = 0      # generation at which the cycle starts
+        self._current = df.copy()
+        self._store_frame()
+
+    def _store_frame(self):
+        """Pack the current grid, append it and check whether it closes a cycle."""
+        packed = np.packbits(self._current.astype(np.uint8), axis=None).tobytes()
+        index = len(self.frames)
+        generation = self.first_generation + index
+        key = (packed, generation % 2)
+        if key in self.seen:
+            first = self.seen[key]
+            self.period = index - first
+            self.cycle_start = self.first_generation + first
+            return
+        self.seen[key] = index
+        self.frames.append(packed)
+
+    def edit(self, df, generation):
+        """
+        Restart from an edited grid (e.g. cells toggled in the viewer) at a generation.
+
+        Every cached frame is dropped, earlier ones included: they led to the unedited grid, not to
+        this one. The grid buffer is reused and the cycle is searched again from the edited state.
+
+        Parameters: df (np.ndarray): edited grid, generation (int): its generation number
+        """
+        self.first_generation = generation
+        self.frames = []
+        self.seen = {}
+        self.period = 0
+        self.cycle_start = 0
+        self._current[:] = df
+        self._store_frame()
+
+    def _unpack(self, index):
+        """Rebuild the grid stored at a frame index."""
+        height, width = self.shape
+        bits = np.unpackbits(np.frombuffer(self.frames[index], dtype=np.uint8), count=height*width)
+        return bits.reshape(self.shape).astype(self.dtype)
+
+    def last_generation(self):
+        """Latest generation that has been simulated."""
+        return self.first_generation + len(self.frames) - 1
+
+    def extend(self, generation):
+        """
+        Simulate forward until the given generation is cached or a cycle is found.
+
+        Returns: bool: True if the generation can now be answered
+        """
+        while self.period == 0 and self.last_generation() < generation:
+            if len(self.frames) >= self.max_frames:
+                return False
+            if self.last_generation() % 2 == 1:
+                self.odd_gen(self._current)
+            else:
+                self.even_gen(self._current, self.wrap_around)
+            self._store_frame()
+        return True
+
+    def state_at(self, generation):
+        """
+        Grid at an arbitrary generation.
+
+        Parameters: generation (int): generation number (>= the starting generation)
+
+        Returns: np.ndarray: copy of the grid at that generation
+        """
+        if generation < self.first_generation:
+            raise ValueError(f"Generation {generation} is before the first cached generation "
+                             f"{self.first_generation}")
+        if not self.extend(generation):
+            raise ValueError(f"No cycle found within {self.max_frames} frames, "
+                             f"generation {generation} is out of reach")
+        if self.period and generation >= self.cycle_start:
+            generation = self.cycle_start + (generation - self.cycle_start) % self.period
+        return self._unpack(generation - self.first_generation)
+
+    def find_cycle(self):
+        """
+        Simulate until a cycle is found or max_frames is reached.
+
+        Returns:
+        - period: cycle length in generations, 0 if none was found
+        - cycle_start: generation at which the cycle starts
+        """
+        self.extend(self.first_generation + self.max_frames)
+        return self.period, self.cycle_start
+
+
+class CycleDetector:
+    """
+    Find the first repeated state while stepping a grid, keeping only 8 bytes per generation.
+
+    The grid is stepped through the engine with a Fingerprint, so hashing a generation costs
+    O(changed cells). When a fingerprint repeats, the earlier state is rebuilt from the origin
+    grid and compared exactly, so a hash collision can never be reported as a cycle. As in
+    BehaviorsAndCycles.analyze_pattern, a state equal to any earlier state closes the cycle.
+    """
+
+    def __init__(self, df, generation, wrap_around, origin=None, origin_generation=None,
+                 history=None):
+        """
+        Parameters:
+        - df: grid at the given generation (stepped in-place by step)
+        - generation: generation number of df
+        - wrap_around: whether to use wrap-around boundary conditions
+        - origin, origin_generation: an earlier grid and its generation to rebuild states from
+          for exact comparison (default: a copy of df)
+        - history: fingerprints (to_bytes) of every generation from origin_generation up to and
+          including generation, e.g. from a cache checkpoint
+        """
+        height, width = df.shape
+        self.wrap_around = wrap_around
+        self.engine = get_engine(height, width, wrap_around, observed=True)
+        self.fingerprint = Fingerprint(df, generation, wrap_around)
+        self.origin = (df if origin is None else origin).copy()
+        self.origin_generation = generation if origin is None else origin_generation
+        self.seen = {}            # raw fingerprint -> generations with that fingerprint
+        self.history = []         # raw fingerprint of every generation since origin_generation
+        self.period = 0
+        self.cycle_start = 0      # generation at which the cycle starts
+        if history is None:
+            self._observe(df)
+        else:
+            for offset, value in enumerate(history):
+                self._record(int.from_bytes(value, "little"), self.origin_generation + offset)
+
+    @property
+    def generation(self):
+        return self.fingerprint.generation
+
+    def _record(self, value, generation):
+        self.seen.setdefault(value, []).append(generation)
+        self.history.append(value)
+
+    def _observe(self, df):
+        value = self.fingerprint.raw()
+        for earlier in self.seen.get(value, ()):
+            if np.array_equal(self.state_at(earlier), df):
+                self.period = self.generation - earlier
+                self.cycle_start = earlier
+                return
+        self._record(value, self.generation)
+
+    def step(self, df):
+        """
+        Advance df by one generation and check whether it repeats an earlier state.
+
+        Returns: int: period of the cycle, 0 while none has been found
+        """
+        self.engine.step(df, self.generation, fingerprint=self.fingerprint)
+        self._observe(df)
+        return self.period
+
+    def state_at(self, generation):
+        """Rebuild the grid at an earlier generation from the origin (used to confirm a match)."""
+        df = self.origin.copy()
+        self.engine.step_n(df, self.origin_generation, generation - self.origin_generation)
+        return df
+
+    def history_bytes(self):
+        """Fingerprints of every generation seen, packed for storage."""
+        return b"".join(value.to_bytes(FINGERPRINT_SIZE, "little") for value in self.history)
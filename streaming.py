@@ -0,0 +1,145 @@
+import numpy as np
+from engine import BLOCK_RULE
+
+# Target size of one band read from the grid file; two bands are held in RAM during a pass
+BAND_BYTES = 64 * 1024 * 1024
+
+
+def default_band_rows(width, band_bytes=BAND_BYTES):
+    """Even number of rows filling about band_bytes, at least one block tall."""
+    rows = max(2, band_bytes // max(width, 1))
+    return rows - rows % 2
+
+
+def _update_pairs(pairs, odd, wrap_around, histogram=None):
+    """
+    Apply the block rule to stacked row pairs in-place.
+
+    Parameters:
+    - pairs: np.ndarray of shape (n_pairs, 2, width), each entry the two rows of a block row
+    - odd: odd generation (blocks start at column 0) or even (blocks start at column 1)
+    - wrap_around: for even generations, whether the last column pairs with column 0
+    - histogram: optional int64 array of 16 block-code counts to add this update's codes to
+    """
+    width = pairs.shape[2]
+    if not odd and wrap_around:
+        shifted = np.roll(pairs, -1, axis=2)
+        _update_pairs(shifted, True, False, histogram)
+        pairs[:] = np.roll(shifted, 1, axis=2)
+        return
+    if odd:
+        cells = pairs[:, :, 0:2*(width//2)]
+    else:
+        cells = pairs[:, :, 1:1 + 2*((width-1)//2)]
+    tl, tr = cells[:, 0, 0::2], cells[:, 0, 1::2]
+    bl, br = cells[:, 1, 0::2], cells[:, 1, 1::2]
+    code = tl | (tr << 1) | (bl << 2) | (br << 3)
+    if histogram is not None:
+        histogram += np.bincount(code.ravel(), minlength=16)
+    new_code = BLOCK_RULE[code]
+    tl[:] = new_code & 1
+    tr[:] = (new_code >> 1) & 1
+    bl[:] = (new_code >> 2) & 1
+    br[:] = (new_code >> 3) & 1
+
+
+def _odd_pass(grid, odd_rows, band_rows, histogram):
+    """Odd generation: row pairs (0,1), (2,3), ... never cross an even-aligned band."""
+    height, width = grid.shape
+    for start in range(0, odd_rows, band_rows):
+        stop = min(start + band_rows, odd_rows)
+        band = np.array(grid[start:stop])
+        _update_pairs(band.reshape(-1, 2, width), True, False, histogram)
+        grid[start:stop] = band
+
+
+def _even_pass(grid, wrap_around, band_rows, histogram):
+    """
+    Even generation: row pairs (1,2), (3,4), ... and, with wrap-around, (height-1, 0).
+
+    Bands are read and written at even-aligned offsets. The last row of each band pairs with the
+    first row of the next one, so a band is written only after the next band has been read and
+    the straddling pair updated. Row 0 is carried to the end of the pass for the wrap seam.
+    """
+    height, width = grid.shape
+    previous = None
+    previous_start = 0
+    row0 = None
+    for start in range(0, height, band_rows):
+        stop = min(start + band_rows, height)
+        band = np.array(grid[start:stop])
+        if start == 0:
+            row0 = band[0].copy()
+
+        if previous is not None:
+            # Pair (start-1, start) straddles the band boundary; start is even, so start-1 is odd
+            pair = np.stack([previous[-1], band[0]])[None]
+            _update_pairs(pair, False, wrap_around, histogram)
+            previous[-1], band[0] = pair[0, 0], pair[0, 1]
+            grid[previous_start:previous_start + len(previous)] = previous
+
+        # Pairs fully inside the band start at the first odd row
+        first = 1 if start % 2 == 0 else 0
+        n_pairs = (len(band) - first) // 2
+        if n_pairs:
+            _update_pairs(band[first:first + 2*n_pairs].reshape(n_pairs, 2, width), False,
+                          wrap_around, histogram)
+        previous, previous_start = band, start
+
+    if wrap_around:
+        pair = np.stack([previous[-1], row0])[None]
+        _update_pairs(pair, False, True, histogram)
+        previous[-1] = pair[0, 0]
+        grid[previous_start:previous_start + len(previous)] = previous
+        grid[0] = pair[0, 1]
+    else:
+        grid[previous_start:previous_start + len(previous)] = previous
+
+
+def stream_step(grid, generation, wrap_around, band_rows=None, histogram=None):
+    """
+    Apply one generation to a (memory-mapped) uint8 grid, streaming it band by band.
+
+    Only two bands and one carried row are in memory at a time, so the grid can be far larger
+    than RAM. Wrap-around needs even dimensions so that the blocks tile the torus.
+
+    Parameters:
+    - grid: np.memmap (or ndarray) of uint8 0/1 cells, updated in-place
+    - generation: generation number of the grid (odd generations use blocks starting at 0)
+    - wrap_around: whether to use wrap-around boundary conditions
+    - band_rows: even number of rows per band, default about BAND_BYTES per band
+    - histogram: optional int64 array of 16 counts, incremented with every updated block's code
+    """
+    height, width = grid.shape
+    if wrap_around and (height % 2 or width % 2):
+        raise ValueError("Streaming with wrap-around needs even grid dimensions")
+    band_rows = band_rows or default_band_rows(width)
+    if band_rows % 2:
+        raise ValueError("band_rows must be even")
+    if generation % 2 == 1:
+        _odd_pass(grid, 2*(height//2), band_rows, histogram)
+    else:
+        _even_pass(grid, wrap_around, band_rows, histogram)
+
+
+def simulate_file(path, height, width, generations, wrap_around=True, generation=1, band_rows=None):
+    """
+    Simulate a grid stored in a raw uint8 file (e.g. created by random_init.fill_memmap).
+
+    Parameters:
+    - path: grid file of height*width bytes, updated in-place
+    - height, width: grid dimensions
+    - generations: number of generations to simulate
+    - wrap_around: whether to use wrap-around boundary conditions
+    - generation: generation number of the grid in the file
+    - band_rows: rows per band, default about BAND_BYTES per band
+
+    Returns: int: generation number of the grid now in the file
+    """
+    grid = np.memmap(path, dtype=np.uint8, mode="r+", shape=(height, width))
+    for _ in range(generations):
+        stream_step(grid, generation, wrap_around, band_rows)
+        generation += 1
+    grid.flush()
+    del grid
+    return generation
@@ -0,0 +1,223 @@
+import os
+import csv
+import time
+import sqlite3
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import Fingerprint, get_engine
+from patterns import BUILTIN_RLE, builtin_pattern, place
+
+DEFAULT_QUEUE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "cellular_automaton",
+                                  "study.sqlite")
+
+# Copies of the pattern sit at these fractions of the grid size, i.e. (25,25), (45,45), (65,65)
+# on the 100x100 grid of BehaviorsAndCycles.initialize_automaton
+POSITION_FRACTIONS = (0.25, 0.45, 0.65)
+
+COLUMNS = ("pattern", "height", "width", "period", "cycle_start", "generations", "seconds")
+
+
+def study_grid(pattern, height, width):
+    """Initial torus for a study job: three copies of a built-in pattern, scaled with the size."""
+    df = np.zeros((height, width), dtype=np.uint8)
+    positions = [(int(fraction * height), int(fraction * width)) for fraction in POSITION_FRACTIONS]
+    place(df, builtin_pattern(pattern), positions, wrap_around=True)
+    return df
+
+
+class _Walker:
+    """A grid with its fingerprint, stepped two generations (odd, then even) at a time."""
+
+    def __init__(self, df, engine):
+        self.df = df
+        self.engine = engine
+        self.fingerprint = Fingerprint(df, 1, engine.wrap_around)
+
+    def advance(self):
+        generation = self.engine.step(self.df, self.fingerprint.generation,
+                                      fingerprint=self.fingerprint)
+        self.engine.step(self.df, generation, fingerprint=self.fingerprint)
+
+    def same_state(self, other):
+        # Fingerprints first; equal ones are confirmed exactly
+        return (self.fingerprint.value == other.fingerprint.value and
+                np.array_equal(self.df, other.df))
+
+
+def find_period(df, wrap_around=True, max_generations=1000000):
+    """
+    Cycle of a grid, holding two grids and their fingerprints in memory whatever the period.
+
+    The block rule is a bijection, so every state lies on a cycle back to itself: the cycle
+    starts at generation 1 and closes the first time the initial state comes back. States are
+    compared at odd generations only, since odd and even generations use different block
+    partitions; the period is therefore even.
+
+    Parameters:
+    - df: grid at generation 1 (not modified)
+    - wrap_around: whether to use wrap-around boundary conditions
+    - max_generations: give up after about this many generations
+
+    Returns:
+    - period: cycle length in generations, 0 if none was found
+    - cycle_start: generation at which the cycle starts (1), 0 if none was found
+    - generations: generations simulated
+    """
+    height, width = df.shape
+    engine = get_engine(height, width, wrap_around, observed=True)
+    origin = _Walker(df.astype(np.uint8), engine)
+    walker = _Walker(df.astype(np.uint8), engine)
+    generations = 0
+    while generations < max_generations:
+        walker.advance()
+        generations += 2
+        if walker.same_state(origin):
+            return generations, 1, generations
+    return 0, 0, generations
+
+
+def run_job(pattern, height, width, wrap_around, max_generations):
+    """One study configuration (runs in a worker process). Returns a result row as a dict."""
+    started = time.perf_counter()
+    period, cycle_start, generations = find_period(study_grid(pattern, height, width),
+                                                   wrap_around, max_generations)
+    return {"pattern": pattern, "height": height, "width": width, "period": period,
+            "cycle_start": cycle_start, "generations": generations,
+            "seconds": time.perf_counter() - started}
+
+
+class JobQueue:
+    """
+    Study configurations and their results in SQLite, so an interrupted sweep can be resumed.
+
+    Each result is committed as soon as it arrives; on restart only jobs without a result run.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                pattern TEXT NOT NULL,
+                height INTEGER NOT NULL,
+                width INTEGER NOT NULL,
+                wrap_around INTEGER NOT NULL,
+                max_generations INTEGER NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                period INTEGER,
+                cycle_start INTEGER,
+                generations INTEGER,
+                seconds REAL,
+                PRIMARY KEY (pattern, height, width, wrap_around, max_generations)
+            )""")
+        self.connection.commit()
+
+    def add(self, patterns, sizes, wrap_around=True, max_generations=1000000):
+        """Queue every (pattern, size) pair not queued already."""
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO jobs (pattern, height, width, wrap_around, max_generations) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(pattern, height, width, int(wrap_around), max_generations)
+             for pattern in patterns for height, width in sizes])
+        self.connection.commit()
+
+    def pending(self, patterns, sizes, wrap_around=True, max_generations=1000000):
+        """
+        Jobs of these (pattern, size) pairs without a result, smallest grids first.
+
+        Unfinished jobs queued by other studies in the same file are left alone.
+        """
+        wanted = {(pattern, height, width) for pattern in patterns for height, width in sizes}
+        rows = self.connection.execute(
+            "SELECT pattern, height, width, wrap_around, max_generations FROM jobs "
+            "WHERE done = 0 AND wrap_around = ? AND max_generations = ? "
+            "ORDER BY height * width, pattern", (int(wrap_around), max_generations)).fetchall()
+        return [row for row in rows if row[:3] in wanted]
+
+    def finish(self, job, result):
+        self.connection.execute(
+            "UPDATE jobs SET done = 1, period = ?, cycle_start = ?, generations = ?, seconds = ? "
+            "WHERE pattern = ? AND height = ? AND width = ? AND wrap_around = ? "
+            "AND max_generations = ?",
+            (result["period"], result["cycle_start"], result["generations"], result["seconds"],
+             *job))
+        self.connection.commit()
+
+    def results(self, wrap_around=True, max_generations=1000000):
+        """Finished jobs as dicts with the COLUMNS keys, ordered by pattern and size."""
+        rows = self.connection.execute(
+            "SELECT pattern, height, width, period, cycle_start, generations, seconds FROM jobs "
+            "WHERE done = 1 AND wrap_around = ? AND max_generations = ? "
+            "ORDER BY pattern, height, width", (int(wrap_around), max_generations)).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def close(self):
+        self.connection.close()
+
+
+def run_study(patterns=None, sizes=None, wrap_around=True, max_generations=1000000,
+              queue_path=DEFAULT_QUEUE_PATH, workers=None, output=None, quiet=False):
+    """
+    Period versus torus size for each seed pattern.
+
+    Parameters:
+    - patterns: built-in pattern names, default all
+    - sizes: list of (height, width), default heights 8, 12, ..., 24 each with width = height
+      and width = height + 1 (even, odd, square and rectangular tori)
+    - wrap_around: whether to use wrap-around boundary conditions
+    - max_generations: cap per configuration
+    - queue_path: SQLite job queue; rerunning with the same path resumes the sweep
+    - workers: worker processes, default os.cpu_count()
+    - output: optional CSV path for the result table
+    - quiet: do not print progress or the result table
+
+    Returns: list of result dicts (see COLUMNS), including jobs finished in earlier runs
+    """
+    patterns = patterns or list(BUILTIN_RLE)
+    unknown = [pattern for pattern in patterns if pattern not in BUILTIN_RLE]
+    if unknown:
+        raise ValueError(f"Unknown patterns {unknown}, choose from {sorted(BUILTIN_RLE)}")
+    sizes = [tuple(size) for size in sizes or
+             [(height, width) for height in range(8, 25, 4) for width in (height, height + 1)]]
+    workers = workers or os.cpu_count() or 1
+    queue = JobQueue(queue_path)
+    queue.add(patterns, sizes, wrap_around, max_generations)
+    jobs = queue.pending(patterns, sizes, wrap_around, max_generations)
+    if not quiet:
+        print(f"\nPeriod vs torus size: {len(jobs)} jobs to run, {workers} workers")
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(run_job, *job): job for job in jobs}
+                for future in as_completed(futures):
+                    queue.finish(futures[future], future.result())
+        else:
+            for job in jobs:
+                queue.finish(job, run_job(*job))
+        wanted = set(sizes)
+        results = [row for row in queue.results(wrap_around, max_generations)
+                   if row["pattern"] in patterns and (row["height"], row["width"]) in wanted]
+    finally:
+        queue.close()
+
+    if not quiet:
+        print_study_table(results)
+    if output:
+        with open(output, "w", newline="") as stream:
+            writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(results)
+    return results
+
+
+def print_study_table(results):
+    print("Pattern             |  Size   |  Period | Cycle start | Seconds")
+    print("--------------------|---------|---------|-------------|--------")
+    for row in results:
+        size = f"{row['height']}x{row['width']}"
+        period = row["period"] or "none"
+        print(f"{row['pattern'].ljust(20)}| {size.ljust(8)}| {str(period).rjust(7)} | "
+              f"{str(row['cycle_start']).rjust(11)} | {row['seconds']:.3f}")
@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Braille dot bit for each cell of a 4-row x 2-column character cell
+BRAILLE_DOTS = np.array([[0x01, 0x08],
+                         [0x02, 0x10],
+                         [0x04, 0x20],
+                         [0x40, 0x80]], dtype=np.uint16)
+BRAILLE_BASE = 0x2800
+
+# Half-block characters indexed by top + 2*bottom
+HALF_BLOCKS = np.array([ord(' '), ord('▀'), ord('▄'), ord('█')], dtype=np.uint32)
+
+# Unchanged characters between two changed runs shorter than this are re-sent instead of
+# emitting another cursor move (a move costs about 8 bytes)
+MERGE_GAP = 6
+
+# First screen row of the grid (row 1 holds the title)
+GRID_TOP = 2
+
+
+def is_headless():
+    """True when there is no display to open a matplotlib window on."""
+    if sys.platform.startswith("linux"):
+        return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return False
+
+
+def grid_to_chars(df, mode="braille"):
+    """
+    Pack grid cells into terminal character codes.
+
+    Parameters: df (np.ndarray): grid of 0/1, mode (str): "braille" (2x4 cells per character)
+                or "halfblock" (1x2 cells per character)
+
+    Returns: np.ndarray (uint32) of Unicode code points, one per character cell
+    """
+    cells = np.asarray(df).astype(bool)
+    if mode == "braille":
+        cell_h, cell_w = 4, 2
+    elif mode == "halfblock":
+        cell_h, cell_w = 2, 1
+    else:
+        raise ValueError(f"Unknown terminal mode: {mode}")
+    height, width = cells.shape
+    cells = np.pad(cells, ((0, -height % cell_h), (0, -width % cell_w)))
+    blocks = cells.reshape(cells.shape[0] // cell_h, cell_h, cells.shape[1] // cell_w, cell_w)
+    if mode == "braille":
+        bits = (blocks * BRAILLE_DOTS[:, None, :]).sum(axis=(1, 3), dtype=np.uint32)
+        return bits + BRAILLE_BASE
+    return HALF_BLOCKS[blocks[:, 0, :, 0] + 2 * blocks[:, 1, :, 0]]
+
+
+def changed_runs(changed_row):
+    """
+    Runs of changed characters in one row, merged across short unchanged gaps.
+
+    Returns: list of (start, stop) column ranges
+    """
+    columns = np.flatnonzero(changed_row)
+    if columns.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(columns) > MERGE_GAP)
+    starts = np.concatenate(([columns[0]], columns[breaks + 1]))
+    stops = np.concatenate((columns[breaks], [columns[-1]])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+class TerminalRenderer:
+    """
+    Draw generations in a terminal with ANSI escapes, sending only the characters that changed.
+
+    The first frame clears the screen; later frames move the cursor to each run of changed
+    characters and rewrite just that run, which keeps the output small over SSH.
+    """
+
+    def __init__(self, mode="braille", stream=None):
+        self.mode = mode
+        self.stream = stream or sys.stdout
+        self.previous = None
+        self.bytes_written = 0
+
+    def frame_output(self, chars, title):
+        """Escape sequence string that turns the previous frame into this one."""
+        parts = []
+        if self.previous is None or self.previous.shape != chars.shape:
+            parts.append("\x1b[?25l\x1b[2J")  # hide cursor, clear screen
+            changed = np.ones(chars.shape, dtype=bool)
+        else:
+            changed = chars != self.previous
+        parts.append(f"\x1b[1;1H{title}\x1b[K")
+        for row in np.flatnonzero(changed.any(axis=1)):
+            for start, stop in changed_runs(changed[row]):
+                text = "".join(map(chr, chars[row, start:stop]))
+                parts.append(f"\x1b[{row + GRID_TOP};{start + 1}H{text}")
+        return "".join(parts)
+
+    def display(self, df, generation, pause_time=0.0):
+        """Draw one generation and wait pause_time seconds."""
+        chars = grid_to_chars(df, self.mode)
+        output = self.frame_output(chars, f"Generation: {generation}")
+        self.previous = chars
+        self.stream.write(output)
+        self.stream.flush()
+        self.bytes_written += len(output.encode("utf-8"))
+        if pause_time:
+            time.sleep(pause_time)
+
+    def close(self):
+        """Restore the cursor below the last frame."""
+        if self.previous is not None:
+            self.stream.write(f"\x1b[{len(self.previous) + GRID_TOP};1H\x1b[?25h\n")
+            self.stream.flush()
+
+
+def run_in_terminal(df, generation, wrap_around, odd_gen, even_gen, max_generations,
+                    pause_time=0.0, mode="braille"):
+    """
+    Simulation loop drawing to the terminal, the headless counterpart of the matplotlib loops.
+
+    Parameters:
+    - df: grid at the given generation (updated in-place)
+    - generation: generation number of df
+    - wrap_around: whether to use wrap-around boundary conditions
+    - odd_gen, even_gen: in-place step functions
+    - max_generations: number of generations to simulate
+    - pause_time: pause between frames
+    - mode: "braille" or "halfblock"
+
+    Returns: int: last generation shown
+    """
+    renderer = TerminalRenderer(mode)
+    renderer.display(df, generation, pause_time)
+    try:
+        for _ in range(max_generations):
+            if generation % 2 == 1:
+                odd_gen(df)
+            else:
+                even_gen(df, wrap_around)
+            generation += 1
+            renderer.display(df, generation, pause_time)
+    finally:
+        renderer.close()
+    return generation